@@ -109,6 +109,8 @@ class Core(object):
     def updateSXTools(self):
         # startTimeOcc = maya.cmds.timerX()
         maya.cmds.undoInfo(stateWithoutFlush=False)
+        sxglobals.tools.meshCache.clear()
+        sxglobals.layers.verifyCache = None
         self.selectionManager()
         self.refreshSXTools()
         self.verifySceneState()
@@ -277,7 +279,7 @@ class Core(object):
            not (maya.cmds.optionVar(exists='SXToolsSettingsFile')) or
            ('LayerData' not in sxglobals.settings.project)):
             sxglobals.settings.tools['compositeEnabled'] = False
-            sxglobals.ui.setupProjectUI()
+            sxglobals.ui.buildSuspended(sxglobals.ui.setupProjectUI)
 
         # If exported objects selected, construct message
         elif sxglobals.export.checkExported(sxglobals.settings.objectArray):
@@ -300,7 +302,7 @@ class Core(object):
             maya.cmds.setAttr('hardwareRenderingGlobals.ssaoEnable', 1)
             # hacky hack to refresh the layer editor
             maya.cmds.delete(maya.cmds.createDisplayLayer(empty=True))
-            sxglobals.ui.exportObjectsUI()
+            sxglobals.ui.buildSuspended(sxglobals.ui.exportObjectsUI)
 
         # If skinned meshes are selected, construct message
         elif sxglobals.tools.checkSkinMesh(sxglobals.settings.objectArray):
@@ -311,17 +313,17 @@ class Core(object):
             maya.cmds.editDisplayLayerGlobals(cdl='skinMeshLayer')
             # hacky hack to refresh the layer editor
             maya.cmds.delete(maya.cmds.createDisplayLayer(empty=True))
-            sxglobals.ui.skinMeshUI()
+            sxglobals.ui.buildSuspended(sxglobals.ui.skinMeshUI)
 
         # If objects have empty color sets, construct error message
         elif sxglobals.layers.verifyObjectLayers(sxglobals.settings.shapeArray)[0] == 1:
             sxglobals.settings.tools['compositeEnabled'] = False
-            sxglobals.ui.emptyObjectsUI()
+            sxglobals.ui.buildSuspended(sxglobals.ui.emptyObjectsUI)
 
         # If objects have mismatching color sets, construct error message
         elif sxglobals.layers.verifyObjectLayers(sxglobals.settings.shapeArray)[0] == 2:
             sxglobals.settings.tools['compositeEnabled'] = False
-            sxglobals.ui.mismatchingObjectsUI()
+            sxglobals.ui.buildSuspended(sxglobals.ui.mismatchingObjectsUI)
 
         # Construct layer tools window
         else:
@@ -358,18 +360,24 @@ class Core(object):
             if sxglobals.ui.multiShapes and not sxglobals.ui.history:
                 sxglobals.ui.multiShapesUI()
 
-            sxglobals.ui.layerViewUI()
-            sxglobals.ui.applyColorToolUI()
-            sxglobals.ui.gradientToolUI()
-            sxglobals.ui.bakeOcclusionToolUI()
-            sxglobals.ui.masterPaletteToolUI()
-            sxglobals.ui.materialToolUI()
-            sxglobals.ui.assignCreaseToolUI()
-            sxglobals.ui.createSkinMeshUI()
-            sxglobals.ui.exportFlagsUI()
-            sxglobals.ui.exportButtonUI()
+            ui = sxglobals.ui
+            ui.buildSuspended(
+                ui.layerViewUI,
+                ui.applyColorToolUI,
+                ui.gradientToolUI,
+                ui.bakeOcclusionToolUI,
+                ui.masterPaletteToolUI,
+                ui.materialToolUI,
+                ui.assignCreaseToolUI,
+                ui.createSkinMeshUI,
+                ui.exportFlagsUI,
+                ui.exportButtonUI)
 
             sxglobals.layers.refreshLayerList()
             sxglobals.layers.compositeLayers()
 
+        # the single-panel views shrink the dock to fit
+        if not sxglobals.settings.tools['compositeEnabled']:
+            sxglobals.ui.resizeDock()
+
         maya.cmds.setFocus('MayaWindow')
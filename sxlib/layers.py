@@ -11,6 +11,8 @@ import sxglobals
 
 class LayerManagement(object):
     def __init__(self):
+        self.refLayerCache = None
+        self.verifyCache = None
         return None
 
     def __del__(self):
@@ -38,22 +40,11 @@ class LayerManagement(object):
                 targetColorArray = OM.MColorArray()
                 targetColorArray = MFnMesh.getFaceVertexColors(colorSet='layer1')
 
-                faceIds = OM.MIntArray()
-                vtxIds = OM.MIntArray()
-
                 lenSel = len(targetColorArray)
 
-                faceIds.setLength(lenSel)
-                vtxIds.setLength(lenSel)
-
                 # generate faceID and vertexID arrays
-                fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-                k = 0
-                while not fvIt.isDone():
-                    faceIds[k] = fvIt.faceId()
-                    vtxIds[k] = fvIt.vertexId()
-                    k += 1
-                    fvIt.next()
+                faceIds, vtxIds, fvIds = sxglobals.tools.getFaceVertexIds(
+                    MFnMesh)
 
                 sel = str(selected)
                 shading = int(maya.cmds.getAttr(sel + '.shadingMode'))
@@ -63,15 +54,11 @@ class LayerManagement(object):
                 vis = bool(maya.cmds.getAttr(sel + visAttr))
 
                 if not vis:
-                    fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-                    k = 0
-                    while not fvIt.isDone():
+                    for k in xrange(lenSel):
                         targetColorArray[k].r = 0.0
                         targetColorArray[k].g = 0.0
                         targetColorArray[k].b = 0.0
                         targetColorArray[k].a = 1.0
-                        k += 1
-                        fvIt.next()
 
                 # accumulate targetColorArray through the remaining layers
                 if shading == 0:
@@ -87,14 +74,11 @@ class LayerManagement(object):
                             sourceColorArray = MFnMesh.getFaceVertexColors(
                                 colorSet=sourceLayer)
 
-                            fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-
                             if not vis:
                                 continue
 
                             elif mode == 0:
-                                k = 0
-                                while not fvIt.isDone():
+                                for k in xrange(lenSel):
                                     targetColorArray[k].r = (
                                         sourceColorArray[k].r * sourceColorArray[k].a +
                                         targetColorArray[k].r * (1 - sourceColorArray[k].a))
@@ -105,12 +89,9 @@ class LayerManagement(object):
                                         sourceColorArray[k].b * sourceColorArray[k].a +
                                         targetColorArray[k].b * (1 - sourceColorArray[k].a))
                                     #targetColorArray[k].a = 1.0
-                                    k += 1
-                                    fvIt.next()
 
                             elif mode == 1:
-                                k = 0
-                                while not fvIt.isDone():
+                                for k in xrange(lenSel):
                                     targetColorArray[k].r += sourceColorArray[
                                         k].r * sourceColorArray[k].a
                                     targetColorArray[k].g += sourceColorArray[
@@ -118,13 +99,10 @@ class LayerManagement(object):
                                     targetColorArray[k].b += sourceColorArray[
                                         k].b * sourceColorArray[k].a
                                     #targetColorArray[k].a = 1.0
-                                    k += 1
-                                    fvIt.next()
 
                             elif mode == 2:
                                 # layer2 lerp with white using (1-alpha), multiply with layer1
-                                k = 0
-                                while not fvIt.isDone():
+                                for k in xrange(lenSel):
                                     sourceColorArray[k].r = (
                                         (sourceColorArray[k].r * sourceColorArray[k].a) +
                                         (1.0 * (1 - sourceColorArray[k].a)))
@@ -141,35 +119,25 @@ class LayerManagement(object):
                                         k].g * targetColorArray[k].g
                                     targetColorArray[k].b = sourceColorArray[
                                         k].b * targetColorArray[k].b
-                                    k += 1
-                                    fvIt.next()
                             else:
                                 print('SX Tools Error: Invalid blend mode')
                                 return
 
                 elif shading == 1:
                     targetColorArray = MFnMesh.getFaceVertexColors(colorSet=sxglobals.settings.tools['selectedLayer'])
-                    fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-                    k = 0
-                    while not fvIt.isDone():
+                    for k in xrange(lenSel):
                         if targetColorArray[k].a == 0.0:
                             targetColorArray[k].r = 0.0
                             targetColorArray[k].g = 0.0
                             targetColorArray[k].b = 0.0
-                        k += 1
-                        fvIt.next()
 
                 elif shading == 2:
                     targetColorArray = MFnMesh.getFaceVertexColors(colorSet=sxglobals.settings.tools['selectedLayer'])
-                    fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-                    k = 0
-                    while not fvIt.isDone():
+                    for k in xrange(lenSel):
                         targetColorArray[k].r = targetColorArray[k].a
                         targetColorArray[k].g = targetColorArray[k].a
                         targetColorArray[k].b = targetColorArray[k].a
                         targetColorArray[k].a = 1.0
-                        k += 1
-                        fvIt.next()
 
                 MFnMesh.setFaceVertexColors(targetColorArray, faceIds, vtxIds)
 
@@ -200,36 +168,18 @@ class LayerManagement(object):
 
             sourceColorArray = OM.MColorArray()
             targetColorArray = OM.MColorArray()
-            fillColorArray = OM.MColorArray()
             sourceColorArray = MFnMesh.getFaceVertexColors(
                 colorSet=sourceLayer)
             targetColorArray = MFnMesh.getFaceVertexColors(
                 colorSet=targetLayer)
-            fillColorArray = MFnMesh.getFaceVertexColors(
-                colorSet = sourceLayer)
-            faceIds = OM.MIntArray()
-            vtxIds = OM.MIntArray()
 
             lenSel = len(sourceColorArray)
-
-            faceIds.setLength(lenSel)
-            vtxIds.setLength(lenSel)
-
-            fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-            k = 0
-            while not fvIt.isDone():
-                faceIds[k] = fvIt.faceId()
-                vtxIds[k] = fvIt.vertexId()
-                fillColorArray[k] = fillColor
-                k += 1
-                fvIt.next()
-
-            fvIt = OM.MItMeshFaceVertex(nodeDagPath)
+            fillColorArray = OM.MColorArray(lenSel, fillColor)
+            faceIds, vtxIds, fvIds = sxglobals.tools.getFaceVertexIds(MFnMesh)
 
             # alpha blend
             if mode == 0:
-                k = 0
-                while not fvIt.isDone():
+                for k in xrange(lenSel):
                     targetColorArray[k].r = (
                         sourceColorArray[k].r * sourceColorArray[k].a +
                         targetColorArray[k].r * (1 - sourceColorArray[k].a))
@@ -242,16 +192,10 @@ class LayerManagement(object):
                     targetColorArray[k].a += sourceColorArray[k].a
                     if targetColorArray[k].a > 1.0:
                        targetColorArray[k].a = 1.0
-                    k += 1
-                    fvIt.next()
 
             # additive
             elif mode == 1:
-                k = 0
-                while not fvIt.isDone():
-                    faceIds[k] = fvIt.faceId()
-                    vtxIds[k] = fvIt.vertexId()
-
+                for k in xrange(lenSel):
                     targetColorArray[k].r += sourceColorArray[
                         k].r * sourceColorArray[k].a
                     targetColorArray[k].g += sourceColorArray[
@@ -261,17 +205,11 @@ class LayerManagement(object):
                     targetColorArray[k].a += sourceColorArray[k].a
                     if targetColorArray[k].a > 1.0:
                        targetColorArray[k].a = 1.0
-                    k += 1
-                    fvIt.next()
 
             # multiply
             elif mode == 2:
                 # layer2 lerp with white using (1-alpha), multiply with layer1
-                k = 0
-                while not fvIt.isDone():
-                    faceIds[k] = fvIt.faceId()
-                    vtxIds[k] = fvIt.vertexId()
-
+                for k in xrange(lenSel):
                     sourceColorArray[k].r = (
                         (sourceColorArray[k].r * sourceColorArray[k].a) +
                         (1.0 * (1 - sourceColorArray[k].a)))
@@ -288,8 +226,6 @@ class LayerManagement(object):
                         k].g * targetColorArray[k].g
                     targetColorArray[k].b = sourceColorArray[
                         k].b * targetColorArray[k].b
-                    k += 1
-                    fvIt.next()
             else:
                 print('SX Tools Error: Invalid blend mode')
                 return
@@ -526,7 +462,7 @@ class LayerManagement(object):
                 maya.cmds.setAttr(str(obj) + attr, 0)
 
     def toggleLayer(self, layer):
-        object = sxglobals.settings.shapeArray[len(sxglobals.settings.shapeArray)-1]
+        object = sxglobals.settings.shapeArray[-1]
         checkState = maya.cmds.getAttr(
             str(object) + '.' + str(layer) + 'Visibility')
         for shape in sxglobals.settings.shapeArray:
@@ -603,23 +539,38 @@ class LayerManagement(object):
             label=sxglobals.settings.tools['selectedDisplayLayer'] + ' Opacity:')
 
         self.getLayerPaletteAndOpacity(
-            sxglobals.settings.shapeArray[
-                len(sxglobals.settings.shapeArray)-1],
-                sxglobals.settings.tools['selectedLayer'])
+            sxglobals.settings.shapeArray[-1],
+            sxglobals.settings.tools['selectedLayer'])
 
     def sortLayers(self, layers):
         sortedLayers = []
         if layers is not None:
-            for ref in sxglobals.settings.refArray:
-                if ref in layers:
-                    sortedLayers.append(ref)
+            layerSet = set(layers)
+            sortedLayers = [
+                ref for ref in sxglobals.settings.refArray if ref in layerSet]
         return sortedLayers
 
+    # Project layers in reference order, reused until
+    # LayerData is replaced or its layer count changes
+    def sortedRefLayers(self):
+        layerData = sxglobals.settings.project['LayerData']
+        if ((self.refLayerCache is None) or
+           (self.refLayerCache[0] is not layerData) or
+           (self.refLayerCache[1] != len(layerData))):
+            refLayers = tuple(self.sortLayers(layerData.keys()))
+            self.refLayerCache = (
+                layerData, len(layerData), refLayers, frozenset(refLayers))
+        return self.refLayerCache[2]
+
+    def refLayerSet(self):
+        self.sortedRefLayers()
+        return self.refLayerCache[3]
+
     def verifyLayerState(self, layer):
         if layer == 'composite':
             return
         else:
-            obj = sxglobals.settings.shapeArray[len(sxglobals.settings.shapeArray)-1]
+            obj = sxglobals.settings.shapeArray[-1]
             selectionList = OM.MSelectionList()
             selectionList.add(obj)
             nodeDagPath = OM.MDagPath()
@@ -663,6 +614,13 @@ class LayerManagement(object):
     # to see if they match the reference set.
     # Also verifies subdivision mode.
     def verifyObjectLayers(self, objects):
+        # the refresh dispatch and the patch panels verify the
+        # same selection, the cache is cleared in core.updateSXTools
+        if ((self.verifyCache is not None) and
+           (self.verifyCache[0] is objects) and
+           (self.verifyCache[1] == len(objects))):
+            return self.verifyCache[2]
+
         refLayers = self.sortLayers(
             sxglobals.settings.project['LayerData'].keys())
         nonStdObjs = []
@@ -687,62 +645,61 @@ class LayerManagement(object):
                 empty = False
 
         if len(nonStdObjs) > 0 and empty:
-            return 1, nonStdObjs
+            result = (1, nonStdObjs)
         elif len(nonStdObjs) > 0 and not empty:
-            return 2, nonStdObjs
+            result = (2, nonStdObjs)
         else:
-            return 0, None
+            result = (0, None)
+
+        self.verifyCache = (objects, len(objects), result)
+        return result
 
     def getLayerPaletteAndOpacity(self, obj, layer):
-        selectionList = OM.MSelectionList()
-        selectionList.add(obj)
-        nodeDagPath = OM.MDagPath()
-        nodeDagPath = selectionList.getDagPath(0)
-        MFnMesh = OM.MFnMesh(nodeDagPath)
-
-        layerColorArray = OM.MColorArray()
-        layerColorArray = MFnMesh.getFaceVertexColors(colorSet=layer)
-        black = OM.MColor()
-        black = (0, 0, 0, 1)
-
-        layerPaletteArray = OM.MColorArray()
-        layerPaletteArray.setLength(8)
-        for k in range(0, 8):
-            layerPaletteArray[k] = black
-
-        n = 0
-        alphaMax = 0
-        for k in range(len(layerColorArray)):
-            match = False
-            for p in range(0, 8):
-                if ((layerColorArray[k].r == layerPaletteArray[p].r) and
-                   (layerColorArray[k].g == layerPaletteArray[p].g) and
-                   (layerColorArray[k].b == layerPaletteArray[p].b)):
-                    match = True
-
-            if (not match) and (n < 8):
-                layerPaletteArray[n] = layerColorArray[k]
-                n += 1
-
-            if layerColorArray[k].a > alphaMax:
-                alphaMax = layerColorArray[k].a
-
-        if maya.cmds.floatSlider('layerOpacitySlider', exists=True):
+        hasPalette = maya.cmds.palettePort('layerPalette', exists=True)
+        hasSlider = maya.cmds.floatSlider('layerOpacitySlider', exists=True)
+
+        # only scan the layer colors if there is a widget to update
+        if hasPalette or hasSlider:
+            selectionList = OM.MSelectionList()
+            selectionList.add(obj)
+            nodeDagPath = OM.MDagPath()
+            nodeDagPath = selectionList.getDagPath(0)
+            MFnMesh = OM.MFnMesh(nodeDagPath)
+
+            layerColorArray = OM.MColorArray()
+            layerColorArray = MFnMesh.getFaceVertexColors(colorSet=layer)
+
+        if hasSlider:
+            alphaMax = max([0] + [color.a for color in layerColorArray])
             maya.cmds.floatSlider(
                 'layerOpacitySlider',
                 edit=True,
                 value=alphaMax)
             sxglobals.settings.layerAlphaMax = alphaMax
 
-        for k in range(0, 8):
-            maya.cmds.palettePort(
-                'layerPalette',
-                edit=True,
-                rgb=(
-                    k,
-                    layerPaletteArray[k].r,
-                    layerPaletteArray[k].g,
-                    layerPaletteArray[k].b))
+        if hasPalette:
+            # first eight unique colors, black only fills empty slots
+            layerPaletteArray = []
+            knownColors = set([(0.0, 0.0, 0.0)])
+            for color in layerColorArray:
+                rgb = (color.r, color.g, color.b)
+                if rgb not in knownColors:
+                    knownColors.add(rgb)
+                    layerPaletteArray.append(rgb)
+                    if len(layerPaletteArray) == 8:
+                        break
+            layerPaletteArray.extend(
+                [(0.0, 0.0, 0.0)] * (8 - len(layerPaletteArray)))
+
+            for k in range(0, 8):
+                maya.cmds.palettePort(
+                    'layerPalette',
+                    edit=True,
+                    rgb=(
+                        k,
+                        layerPaletteArray[k][0],
+                        layerPaletteArray[k][1],
+                        layerPaletteArray[k][2]))
             maya.cmds.palettePort('layerPalette', edit=True, redraw=True)
 
         if 'layer' not in layer:
@@ -809,9 +766,8 @@ class LayerManagement(object):
         sxglobals.settings.tools['selectedLayerIndex'] = selectedIndex
 
         self.getLayerPaletteAndOpacity(
-            sxglobals.settings.shapeArray[
-                len(sxglobals.settings.shapeArray)-1],
-                sxglobals.settings.tools['selectedLayer'])
+            sxglobals.settings.shapeArray[-1],
+            sxglobals.settings.tools['selectedLayer'])
 
         maya.cmds.text(
             'layerBlendModeLabel',
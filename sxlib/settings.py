@@ -192,6 +192,7 @@ class Settings(object):
     def createPreferences(self):
         self.project['DockPosition'] = maya.cmds.radioButtonGrp(
             'dockPrefsButtons', query=True, select=True)
+        # always a new dict, layers.sortedRefLayers caches on its identity
         self.project['LayerData'] = {}
         self.project['RefNames'] = []
         self.project['AlphaTolerance'] = maya.cmds.floatField(
@@ -306,33 +307,25 @@ class Settings(object):
             self.project['LayerData']['emission'][5] = False
             self.project['LayerData']['emission'][2] = None
 
-        if (maya.cmds.textField('alphaOverlay1', query=True, text=True) in
-           sxglobals.settings.project['LayerData'].keys()):
-            self.project['LayerData'][maya.cmds.textField(
-                'alphaOverlay1', query=True, text=True)][2] = (
-                maya.cmds.textField(
-                    'alphaOverlay1Export', query=True, text=True))
-            self.project['LayerData'][maya.cmds.textField(
-                'alphaOverlay1', query=True, text=True)][3] = 1
+        layerData = self.project['LayerData']
+        alpha1 = maya.cmds.textField('alphaOverlay1', query=True, text=True)
+        if alpha1 in layerData:
+            layerData[alpha1][2] = maya.cmds.textField(
+                'alphaOverlay1Export', query=True, text=True)
+            layerData[alpha1][3] = 1
         # else:
-        #     self.project['LayerData'][maya.cmds.textField(
-        #        'alphaOverlay1', query=True, text=True)][3] = False
-        if (maya.cmds.textField('alphaOverlay2', query=True, text=True) in
-           sxglobals.settings.project['LayerData'].keys()):
-            self.project['LayerData'][maya.cmds.textField(
-                'alphaOverlay2', query=True, text=True)][2] = (
-                maya.cmds.textField(
-                    'alphaOverlay2Export', query=True, text=True))
-            self.project['LayerData'][maya.cmds.textField(
-                'alphaOverlay2', query=True, text=True)][3] = 2
-        if (maya.cmds.textField('overlay', query=True, text=True) in
-           sxglobals.settings.project['LayerData'].keys()):
-            self.project['LayerData'][maya.cmds.textField(
-                'overlay', query=True, text=True)][2] = [
-                    x.strip() for x in str(maya.cmds.textField(
-                        'overlayExport', query=True, text=True)).split(',')]
-            self.project['LayerData'][maya.cmds.textField(
-                'overlay', query=True, text=True)][4] = True
+        #     layerData[alpha1][3] = False
+        alpha2 = maya.cmds.textField('alphaOverlay2', query=True, text=True)
+        if alpha2 in layerData:
+            layerData[alpha2][2] = maya.cmds.textField(
+                'alphaOverlay2Export', query=True, text=True)
+            layerData[alpha2][3] = 2
+        overlay = maya.cmds.textField('overlay', query=True, text=True)
+        if overlay in layerData:
+            layerData[overlay][2] = [
+                x.strip() for x in str(maya.cmds.textField(
+                    'overlayExport', query=True, text=True)).split(',')]
+            layerData[overlay][4] = True
 
         self.project['ExportSuffix'] = maya.cmds.checkBox(
             'suffixCheck', query=True, value=True)
@@ -16,11 +16,31 @@ import sxglobals
 
 class ToolActions(object):
     def __init__(self):
+        self.meshCache = {}
+        self.occlusionCache = {}
         return None
 
     def __del__(self):
         print('SX Tools: Exiting tools')
 
+    # Dag path and mesh function set per shape, reused across
+    # tool calls. The cache is cleared by core.updateSXTools(),
+    # entries of deleted nodes are rebuilt on the next request.
+    def getMeshFn(self, shape):
+        if shape in self.meshCache:
+            nodeDagPath, MFnMesh, handle = self.meshCache[shape]
+            if handle.isValid() and nodeDagPath.isValid():
+                return (nodeDagPath, MFnMesh)
+
+        selectionList = OM.MSelectionList()
+        selectionList.add(shape)
+        nodeDagPath = selectionList.getDagPath(0)
+        MFnMesh = OM.MFnMesh(nodeDagPath)
+        self.meshCache[shape] = (
+            nodeDagPath, MFnMesh, OM.MObjectHandle(nodeDagPath.node()))
+
+        return (nodeDagPath, MFnMesh)
+
     def assignToCreaseSet(self, setName):
         modifiers = maya.cmds.getModifiers()
         shift = bool((modifiers & 1) > 0)
@@ -193,59 +213,39 @@ class ToolActions(object):
 
     def calculateCurvature(self, objects, returnColors=False, normalize=False):
         objCurvatures = []
-        objColors = []
         objIds = []
         sxglobals.layers.setColorSet(sxglobals.settings.tools['selectedLayer'])
 
         for obj in objects:
-            selectionList = OM.MSelectionList()
-            selectionList.add(obj)
-            nodeDagPath = OM.MDagPath()
-            nodeDagPath = selectionList.getDagPath(0)
-            MFnMesh = OM.MFnMesh(nodeDagPath)
+            nodeDagPath, MFnMesh = self.getMeshFn(obj)
 
             vtxPoints = OM.MPointArray()
             vtxPoints = MFnMesh.getPoints(OM.MSpace.kWorld)
             numVtx = MFnMesh.numVertices
 
-            vtxNormals = OM.MVectorArray()
-            vtxColors = OM.MColorArray()
-            vtxIds = OM.MIntArray()
+            vtxIds = OM.MIntArray(range(numVtx))
 
             vtxCurvatures = []
 
-            vtxNormals.setLength(numVtx)
-            vtxColors.setLength(numVtx)
-            vtxIds.setLength(numVtx)
+            # accumulate edge angles directly, without
+            # per-vertex edge and angle arrays
+            acos = math.acos
+            pi = math.pi
 
             vtxIt = OM.MItMeshVertex(nodeDagPath)
 
             while not vtxIt.isDone():
                 i = vtxIt.index()
-                vtxIds[i] = vtxIt.index()
-                vtxNormals[i] = vtxIt.getNormal()
+                vtxNormal = vtxIt.getNormal().normal()
+                vtxPoint = vtxPoints[i]
 
-                connectedVertices = OM.MIntArray()
                 connectedVertices = vtxIt.getConnectedVertices()
                 numConnected = len(connectedVertices)
-                edges = OM.MVectorArray()
-                edges.setLength(numConnected)
-                edgeWeights = [None] * numConnected
-                # normEdgeWeights = [None] * numConnected
-                angles = [None] * numConnected
-
-                for e in xrange(numConnected):
-                    edges[e] = (vtxPoints[connectedVertices[e]] - vtxPoints[i])
-                    edgeWeights[e] = edges[e].length()
-                    angles[e] = math.acos(vtxNormals[i].normal() * edges[e].normal())
-
-                # normalize edge weights against max
-                # normEdgeWeights = [float(i)/max(edgeWeights) for i in edgeWeights]
 
                 vtxCurvature = 0.0
-                for e in xrange(numConnected):
-                    curvature = (angles[e] / math.pi - 0.5)  #  * or / float(normEdgeWeights[e])
-                    vtxCurvature += curvature
+                for vtx in connectedVertices:
+                    edge = vtxPoints[vtx] - vtxPoint
+                    vtxCurvature += acos(vtxNormal * edge.normal()) / pi - 0.5
 
                 vtxCurvature = (vtxCurvature / float(numConnected))  # + 0.5
                 if vtxCurvature > 1.0:
@@ -255,11 +255,12 @@ class ToolActions(object):
                 vtxIt.next()
 
             objCurvatures.append(vtxCurvatures)
-            objColors.append(vtxColors)
             objIds.append(vtxIds)
 
         # Normalize convex and concave separately
-        # to maximize artist ability to crease
+        # to maximize artist ability to crease,
+        # otherwise the 0.5 shift is applied in the color pass
+        offset = 0.0
         if normalize:
             #vtxCurvatures = [float(i)/max(vtxCurvatures) for i in vtxCurvatures]
             maxArray = []
@@ -270,62 +271,100 @@ class ToolActions(object):
             minCurv = min(minArray)
             maxCurv = max(maxArray)
 
+            minScale = (-0.5 / float(minCurv)) if minCurv else 0.0
+            maxScale = (0.5 / float(maxCurv)) if maxCurv else 0.0
+
             for vtxCurvatures in objCurvatures:
-                for k in xrange(len(vtxCurvatures)):
-                    if vtxCurvatures[k] < 0:
-                        vtxCurvatures[k] = (vtxCurvatures[k] / float(minCurv)) * -0.5 + 0.5
-                    else:
-                        vtxCurvatures[k] = (vtxCurvatures[k] / float(maxCurv)) * 0.5 + 0.5
+                vtxCurvatures[:] = [
+                    (curv * minScale + 0.5) if curv < 0 else (curv * maxScale + 0.5)
+                    for curv in vtxCurvatures]
         else:
-            for vtxCurvatures in objCurvatures:
-                for k in xrange(len(vtxCurvatures)):
-                    vtxCurvatures[k] = (vtxCurvatures[k] + 0.5)
+            offset = 0.5
+
+        if not returnColors:
+            rampColors = [OM.MColor(color) for color in self.getRampLUT()]
 
         for idx, obj in enumerate(objects):
-            selectionList = OM.MSelectionList()
-            selectionList.add(obj)
-            nodeDagPath = OM.MDagPath()
-            nodeDagPath = selectionList.getDagPath(0)
-            MFnMesh = OM.MFnMesh(nodeDagPath)
+            nodeDagPath, MFnMesh = self.getMeshFn(obj)
 
+            # colors are built in one pass from the
+            # curvature values, not set per channel
             if returnColors:
-                for i in xrange(len(objCurvatures[idx])):
-                    objColors[idx][i].r = objCurvatures[idx][i]
-                    objColors[idx][i].g = objCurvatures[idx][i]
-                    objColors[idx][i].b = objCurvatures[idx][i]
-                    objColors[idx][i].a = 1.0
+                vtxColors = OM.MColorArray(
+                    [OM.MColor((curv + offset, curv + offset, curv + offset, 1.0))
+                     for curv in objCurvatures[idx]])
 
-                return (nodeDagPath, objColors[idx])
+                return (nodeDagPath, vtxColors)
             else:
-                for i in xrange(len(objCurvatures[idx])):
-                    outColor = maya.cmds.colorAtPoint(
-                        'SXRamp', o='RGB', u=(0), v=(objCurvatures[idx][i]))
-                    outAlpha = maya.cmds.colorAtPoint(
-                        'SXAlphaRamp', o='A', u=(0), v=(objCurvatures[idx][i]))
-
-                    objColors[idx][i].r = outColor[0]
-                    objColors[idx][i].g = outColor[1]
-                    objColors[idx][i].b = outColor[2]
-                    objColors[idx][i].a = outAlpha[0]
-
-                MFnMesh.setVertexColors(objColors[idx], objIds[idx])
-
-    def rayRandomizer(self):
-        u1 = random.uniform(0, 1)
-        u2 = random.uniform(0, 1)
-        r = math.sqrt(u1)
-        theta = 2*math.pi*u2
+                vtxColors = OM.MColorArray(
+                    [rampColors[min(max(int((curv + offset) * 255 + 0.5), 0), 255)]
+                     for curv in objCurvatures[idx]])
+
+                MFnMesh.setVertexColors(vtxColors, objIds[idx])
+
+    # Sample SXRamp and SXAlphaRamp once into a 256-step
+    # RGBA lookup table, index with int(value * 255 + 0.5)
+    def getRampLUT(self):
+        steps = [i / 255.0 for i in xrange(256)]
+        rampColors = maya.cmds.colorAtPoint(
+            'SXRamp', o='RGB', u=steps, v=steps)
+        rampAlphas = maya.cmds.colorAtPoint(
+            'SXAlphaRamp', o='A', u=steps, v=steps)
+
+        return [
+            (rampColors[i*3], rampColors[i*3+1], rampColors[i*3+2], rampAlphas[i])
+            for i in xrange(256)]
+
+    # Cosine-weighted hemisphere samples around +Z,
+    # the whole ray set is generated in one call.
+    # A seed gives reproducible bakes.
+    def rayRandomizer(self, count, seed=None):
+        rng = random.Random(seed)
+        uniform = rng.random
+        sqrt = math.sqrt
+        cos = math.cos
+        sin = math.sin
+        twoPi = 2*math.pi
+
+        rays = OM.MVectorArray()
+        rays.setLength(count)
+        for idx in xrange(count):
+            u1 = uniform()
+            theta = twoPi*uniform()
+            r = sqrt(u1)
+            rays[idx] = OM.MVector(
+                r * cos(theta),
+                r * sin(theta),
+                sqrt(max(0, 1 - u1)))
+
+        return rays
+
+    # Occlusion value of a single vertex, vertices are
+    # independent and only read the mesh accelerator.
+    # All rays are rotated and cast in a single pass.
+    def occludeVertex(self, MFnMesh, point, rotQuat, hemiSphere, max, accelGrid, contribution):
+        anyIntersection = MFnMesh.anyIntersection
+        floatVector = OM.MFloatVector
+        space = OM.MSpace.kWorld
+        hits = 0
 
-        x = r * math.cos(theta)
-        y = r * math.sin(theta)
+        # count hits without branching, a miss returns face -1
+        for ray in hemiSphere:
+            hits += anyIntersection(
+                point,
+                floatVector(ray.rotateBy(rotQuat)),
+                space,
+                max,
+                False,
+                accelParams=accelGrid,
+                tolerance=0.001)[2] != -1
 
-        return OM.MVector(x, y, math.sqrt(max(0, 1 - u1)))
+        return 1.0 - hits * contribution
 
     def bakeOcclusion(self, rayCount=250, bias=0.000001, max=10.0, weighted=True, comboOffset=0.9):
         sxglobals.settings.localOcclusionDict.clear()
         sxglobals.settings.globalOcclusionDict.clear()
-        bboxCoords = []
-        newBboxCoords = []
+        bakeBounds = {}
         selectionCache = sxglobals.settings.selectionArray
         sxglobals.settings.bakeSet = sxglobals.settings.shapeArray
         contribution = 1.0/float(rayCount)
@@ -400,6 +439,11 @@ class ToolActions(object):
                 name='comboOcclusionObject')
             sxglobals.settings.bakeSet.append(globalMesh[0])
 
+        # sample the hemisphere once per bake,
+        # all meshes and vertices share the same ray set
+        hemiSphere = self.rayRandomizer(rayCount)
+        forward = OM.MVector(OM.MVector.kZaxisVector)
+
         for bake in sxglobals.settings.bakeSet:
             selectionList = OM.MSelectionList()
             nodeDagPath = OM.MDagPath()
@@ -407,66 +451,41 @@ class ToolActions(object):
             vtxColors = OM.MColorArray()
             vtxIds = OM.MIntArray()
             vtxFloatNormals = OM.MFloatVectorArray()
-            vtxNormal = OM.MVector()
 
             selectionList.add(bake)
             nodeDagPath = selectionList.getDagPath(0)
             MFnMesh = OM.MFnMesh(nodeDagPath)
+            # OpenMaya only exposes uniform grid accelerators, the grid
+            # is built on the first raycast and freed after each mesh
             accelGrid = MFnMesh.autoUniformGridParams()
             vtxPoints = MFnMesh.getPoints(OM.MSpace.kWorld)
             vtxFloatNormals = MFnMesh.getVertexNormals(weighted, OM.MSpace.kWorld)
             numVtx = MFnMesh.numVertices
 
-            vtxColors.setLength(numVtx)
-            vtxIds.setLength(numVtx)
+            occValues = [1.0] * numVtx
+            vtxIds = OM.MIntArray(range(numVtx))
 
-            hemiSphere = OM.MVectorArray()
-            hemiSphere.setLength(rayCount)
-            for idx in xrange(rayCount):
-                hemiSphere[idx] = self.rayRandomizer()
+            # rotations from +Z to every world space vertex normal,
+            # matching the space of the points and rays
+            rotQuats = [
+                forward.rotateTo(OM.MVector(vtxNormal))
+                for vtxNormal in vtxFloatNormals]
 
-            vtxIt = OM.MItMeshVertex(nodeDagPath)
-            while not vtxIt.isDone():
-                i = vtxIt.index()
-                vtxIds[i] = i
-                vtxNormal = vtxIt.getNormal()
+            for i in xrange(numVtx):
                 point = OM.MFloatPoint(vtxPoints[i])
                 point = point + bias*vtxFloatNormals[i]
-                occValue = 1.0
-                forward = OM.MVector(OM.MVector.kZaxisVector)
-                rotQuat = forward.rotateTo(vtxNormal)
-                sampleRays = OM.MFloatVectorArray()
-                sampleRays.setLength(rayCount)
-
-                for e in xrange(rayCount):
-                    sampleRays[e] = OM.MFloatVector(
-                        hemiSphere[e].rotateBy(rotQuat))
-                for e in xrange(rayCount):
-                    result = MFnMesh.anyIntersection(
-                        point,
-                        sampleRays[e],
-                        OM.MSpace.kWorld,
-                        max,
-                        False,
-                        accelParams=accelGrid,
-                        tolerance=0.001)
-                    if result[2] != -1:
-                        occValue = occValue - contribution
-
-                vtxColors[i].r = occValue
-                vtxColors[i].g = occValue
-                vtxColors[i].b = occValue
-                vtxColors[i].a = 1.0
-
-                vtxIt.next()
+                occValues[i] = self.occludeVertex(
+                    MFnMesh, point, rotQuats[i], hemiSphere,
+                    max, accelGrid, contribution)
 
+            vtxColors = OM.MColorArray(
+                [OM.MColor((occ, occ, occ, 1.0)) for occ in occValues])
             MFnMesh.setVertexColors(vtxColors, vtxIds)
             MFnMesh.freeCachedIntersectionAccelerator()
 
             # assign global mesh colors to individual pieces
             if bake == globalMesh[0]:
                 sxglobals.settings.bakeSet.remove(bake)
-                bboxCoords.sort()
                 if len(sxglobals.settings.bakeSet) > 1 or sxglobals.settings.tools['bakeGroundPlane']:
                     newObjs = maya.cmds.polySeparate(globalMesh, ch=False)
                     # merge objects that were combined before bake
@@ -500,58 +519,78 @@ class ToolActions(object):
                                 comboParts[AOSet].append(str(AODag))
                                 break
                         AOIter.next()
+                    mergedParts = set()
                     for key in comboParts:
                         if len(comboParts[key]) > 1:
                             newCombo = maya.cmds.polyUnite(comboParts[key])
                             maya.cmds.parent(newCombo[0], globalMesh[0])
                             newObjs.append(newCombo[0])
-                            for item in comboParts[key]:
-                                newObjs.remove(item)
+                            mergedParts.update(comboParts[key])
+                    newObjs = [
+                        newObj for newObj in newObjs
+                        if newObj not in mergedParts]
                 else:
-                    newObjs = (globalMesh[0], )
+                    newObjs = [globalMesh[0], ]
+
+                # query bounding boxes once and
+                # filter out the groundplane before matching
+                bbxs = {}
+                for newObj in newObjs:
+                    bbxs[newObj] = maya.cmds.exactWorldBoundingBox(newObj)
+                if sxglobals.settings.tools['bakeGroundPlane']:
+                    groundScale = sxglobals.settings.tools['bakeGroundScale']
+                    newObjs = [
+                        newObj for newObj in newObjs
+                        if not ((math.fabs(bbxs[newObj][3] - bbxs[newObj][0]) == groundScale) and
+                                (bbxs[newObj][1] - bbxs[newObj][4]) == 0)]
+
+                # match pieces to the original shapes by topology,
+                # the closest bounding box center wins within a match.
+                # comboOffset shrinks the faces, so the boxes only
+                # approximate the originals.
                 for newObj in newObjs:
-                    bbx = maya.cmds.exactWorldBoundingBox(newObj)
-                    if sxglobals.settings.tools['bakeGroundPlane']:
-                        # ignore groundplane
-                        if (math.fabs(bbx[3] - bbx[0]) == sxglobals.settings.tools['bakeGroundScale']) and (bbx[1] - bbx[4]) == 0:
-                            continue
-                    bbSize = math.fabs(
-                        (bbx[3]-bbx[0]) *
-                        (bbx[4]-bbx[1]) *
-                        (bbx[5]-bbx[3]))
-                    bbId = (
-                        bbx[0] + 10 * bbx[1] + 100 * bbx[2] +
-                        bbx[3] + 10 * bbx[4] + 100 * bbx[5])
-                    newBboxCoords.append(
-                        (bbId, bbSize, bbx[0], bbx[1], bbx[2], newObj))
-
-                newBboxCoords.sort()
-
-                for idx, obj in enumerate(newBboxCoords):
                     selectionList = OM.MSelectionList()
-                    selectionList.add(obj[5])
+                    selectionList.add(newObj)
                     nodeDagPath = selectionList.getDagPath(0)
                     MFnMesh = OM.MFnMesh(nodeDagPath)
+                    candidates = bakeBounds.get(
+                        (MFnMesh.numVertices, MFnMesh.numPolygons))
+                    if not candidates:
+                        print('SX Tools Error: No occlusion match for ' + str(newObj))
+                        continue
+
+                    bbx = bbxs[newObj]
+                    center = (
+                        (bbx[0] + bbx[3]) * 0.5,
+                        (bbx[1] + bbx[4]) * 0.5,
+                        (bbx[2] + bbx[5]) * 0.5)
+                    match = min(
+                        candidates,
+                        key=lambda c: (
+                            (c[0][0] - center[0]) ** 2 +
+                            (c[0][1] - center[1]) ** 2 +
+                            (c[0][2] - center[2]) ** 2))
+                    candidates.remove(match)
+
                     globalColorArray = OM.MColorArray()
                     globalColorArray = MFnMesh.getFaceVertexColors(colorSet='occlusion')
-                    sxglobals.settings.globalOcclusionDict[bboxCoords[idx][5]] = globalColorArray
+                    sxglobals.settings.globalOcclusionDict[match[1]] = globalColorArray
 
                 maya.cmds.delete(globalMesh)
             else:
                 localColorArray = OM.MColorArray()
                 localColorArray = MFnMesh.getFaceVertexColors(colorSet='occlusion')
                 sxglobals.settings.localOcclusionDict[bake] = localColorArray
-                # calculate bounding box and use it to sort shapes
+                # store bounding box center by topology,
+                # used to match the separated global pieces
                 bbx = maya.cmds.exactWorldBoundingBox(bake)
-                bbSize = math.fabs(
-                    (bbx[3] - bbx[0]) *
-                    (bbx[4] - bbx[1]) *
-                    (bbx[5]-bbx[3]))
-                bbId = (
-                    bbx[0] + 10 * bbx[1] + 100 * bbx[2] +
-                    bbx[3] + 10 * bbx[4] + 100 * bbx[5])
-                bboxCoords.append(
-                    (bbId, bbSize, bbx[0], bbx[1], bbx[2], bake))
+                center = (
+                    (bbx[0] + bbx[3]) * 0.5,
+                    (bbx[1] + bbx[4]) * 0.5,
+                    (bbx[2] + bbx[5]) * 0.5)
+                bakeBounds.setdefault(
+                    (MFnMesh.numVertices, MFnMesh.numPolygons),
+                    []).append((center, bake))
 
         # remove redundant tracker colorsets
         for bake in sxglobals.settings.bakeSet:
@@ -647,110 +686,135 @@ class ToolActions(object):
 
         maya.cmds.select(sxglobals.settings.bakeSet)
 
-    def bakeBlendOcclusion(self):
-        startTimeOcc = maya.cmds.timerX()
-        self.bakeOcclusion(
+    # Geometry and bake settings that determine an occlusion bake
+    def getOcclusionKey(self, shapes):
+        shapeKeys = []
+        for shape in shapes:
+            nodeDagPath, MFnMesh = self.getMeshFn(shape)
+            points = MFnMesh.getPoints(OM.MSpace.kWorld)
+            vtxCounts, vtxIds = MFnMesh.getVertices()
+            shapeKeys.append((
+                shape,
+                hash(tuple((point.x, point.y, point.z) for point in points)),
+                hash(tuple(vtxCounts)),
+                hash(tuple(vtxIds))))
+
+        return (
+            tuple(shapeKeys),
             sxglobals.settings.tools['rayCount'],
             sxglobals.settings.tools['bias'],
             sxglobals.settings.tools['maxDistance'],
-            True,
-            sxglobals.settings.tools['comboOffset'])
+            sxglobals.settings.tools['comboOffset'],
+            sxglobals.settings.tools['bakeGroundPlane'],
+            sxglobals.settings.tools['bakeGroundScale'],
+            sxglobals.settings.tools['bakeGroundOffset'])
+
+    def bakeBlendOcclusion(self):
+        startTimeOcc = maya.cmds.timerX()
+
+        # rebaking unchanged geometry with unchanged
+        # settings reuses the previous raycast results
+        occlusionKey = self.getOcclusionKey(sxglobals.settings.shapeArray)
+        if occlusionKey in self.occlusionCache:
+            localDict, globalDict = self.occlusionCache[occlusionKey]
+            sxglobals.settings.localOcclusionDict.clear()
+            sxglobals.settings.localOcclusionDict.update(localDict)
+            sxglobals.settings.globalOcclusionDict.clear()
+            sxglobals.settings.globalOcclusionDict.update(globalDict)
+            sxglobals.settings.bakeSet = sxglobals.settings.shapeArray
+        else:
+            self.bakeOcclusion(
+                sxglobals.settings.tools['rayCount'],
+                sxglobals.settings.tools['bias'],
+                sxglobals.settings.tools['maxDistance'],
+                True,
+                sxglobals.settings.tools['comboOffset'])
+            self.occlusionCache.clear()
+            self.occlusionCache[occlusionKey] = (
+                dict(sxglobals.settings.localOcclusionDict),
+                dict(sxglobals.settings.globalOcclusionDict))
         sxglobals.settings.tools['blendSlider'] = 0.5
         self.blendOcclusion()
         totalTime = maya.cmds.timerX(startTime=startTimeOcc)
         print('SX Tools: Occlusion baking duration ' + str(totalTime))
 
+    # Face vertex colors of the occlusion set per shape
+    def collectOcclusion(self, shapes):
+        occlusionDict = {}
+        for shape in shapes:
+            nodeDagPath, MFnMesh = self.getMeshFn(shape)
+            occlusionDict[shape] = MFnMesh.getFaceVertexColors(
+                colorSet='occlusion')
+
+        return occlusionDict
+
     def bakeBlendOcclusionMR(self):
         startTimeOcc = maya.cmds.timerX()
         ground = sxglobals.settings.tools['bakeGroundPlane']
         sxglobals.settings.tools['bakeGroundPlane'] = False
         sxglobals.settings.tools['bakeTogether'] = False
         self.bakeOcclusionMR()
-
-        for shape in sxglobals.settings.shapeArray:
-            selectionList = OM.MSelectionList()
-            selectionList.add(shape)
-            nodeDagPath = OM.MDagPath()
-            nodeDagPath = selectionList.getDagPath(0)
-            MFnMesh = OM.MFnMesh(nodeDagPath)
-
-            localColorArray = OM.MColorArray()
-            localColorArray = MFnMesh.getFaceVertexColors(colorSet='occlusion')
-            sxglobals.settings.localOcclusionDict[shape] = localColorArray
+        sxglobals.settings.localOcclusionDict.update(
+            self.collectOcclusion(sxglobals.settings.shapeArray))
 
         sxglobals.settings.tools['bakeGroundPlane'] = ground
         sxglobals.settings.tools['bakeTogether'] = True
         self.bakeOcclusionMR()
-
-        for shape in sxglobals.settings.shapeArray:
-            selectionList = OM.MSelectionList()
-            selectionList.add(shape)
-            nodeDagPath = OM.MDagPath()
-            nodeDagPath = selectionList.getDagPath(0)
-            MFnMesh = OM.MFnMesh(nodeDagPath)
-
-            globalColorArray = OM.MColorArray()
-            globalColorArray = MFnMesh.getFaceVertexColors(
-                colorSet='occlusion')
-            sxglobals.settings.globalOcclusionDict[shape] = globalColorArray
+        sxglobals.settings.globalOcclusionDict.update(
+            self.collectOcclusion(sxglobals.settings.shapeArray))
 
         sxglobals.settings.tools['blendSlider'] = 0.5
         self.blendOcclusion()
         totalTime = maya.cmds.timerX(startTime=startTimeOcc)
         print('SX Tools: Occlusion baking duration ' + str(totalTime))
 
+    # Face, vertex and face-relative vertex ids in face-vertex
+    # order, matching getFaceVertexColors() of the same mesh
+    def getFaceVertexIds(self, MFnMesh):
+        faceList = []
+        fvList = []
+        vtxCounts, vtxIds = MFnMesh.getVertices()
+        for face, count in enumerate(vtxCounts):
+            faceList.extend([face] * count)
+            fvList.extend(range(count))
+
+        return (OM.MIntArray(faceList), vtxIds, OM.MIntArray(fvList))
+
     def blendOcclusion(self):
         sliderValue = sxglobals.settings.tools['blendSlider']
 
         for bake in sxglobals.settings.bakeSet:
-            selectionList = OM.MSelectionList()
-            nodeDagPath = OM.MDagPath()
             localColorArray = OM.MColorArray()
             globalColorArray = OM.MColorArray()
             layerColorArray = OM.MColorArray()
             faceIds = OM.MIntArray()
             vtxIds = OM.MIntArray()
-            selectionList.add(bake)
-            nodeDagPath = selectionList.getDagPath(0)
-            MFnMesh = OM.MFnMesh(nodeDagPath)
+            nodeDagPath, MFnMesh = self.getMeshFn(bake)
 
             localColorArray = sxglobals.settings.localOcclusionDict[bake]
             globalColorArray = sxglobals.settings.globalOcclusionDict[bake]
             layerColorArray = MFnMesh.getFaceVertexColors(colorSet='occlusion')
-            lenSel = len(layerColorArray)
-            faceIds.setLength(lenSel)
-            vtxIds.setLength(lenSel)
-
-            fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-
-            k = 0
-            while not fvIt.isDone():
-                faceIds[k] = fvIt.faceId()
-                vtxIds[k] = fvIt.vertexId()
-                layerColorArray[k].r = (
-                    (1-sliderValue) * localColorArray[k].r +
-                    sliderValue * globalColorArray[k].r)
-                layerColorArray[k].g = (
-                    (1-sliderValue) * localColorArray[k].g +
-                    sliderValue * globalColorArray[k].g)
-                layerColorArray[k].b = (
-                    (1-sliderValue) * localColorArray[k].b +
-                    sliderValue * globalColorArray[k].b)
-                k += 1
-                fvIt.next()
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(MFnMesh)
+            inverseValue = 1 - sliderValue
+
+            layerColorArray = OM.MColorArray([
+                OM.MColor((
+                    inverseValue * localColor.r + sliderValue * globalColor.r,
+                    inverseValue * localColor.g + sliderValue * globalColor.g,
+                    inverseValue * localColor.b + sliderValue * globalColor.b,
+                    layerColor.a))
+                for localColor, globalColor, layerColor in zip(
+                    localColorArray, globalColorArray, layerColorArray)])
 
             maya.cmds.polyColorSet(
                 bake, currentColorSet=True, colorSet='occlusion')
             MFnMesh.setFaceVertexColors(layerColorArray, faceIds, vtxIds)
 
         sxglobals.layers.getLayerPaletteAndOpacity(
-            sxglobals.settings.shapeArray[len(sxglobals.settings.shapeArray)-1],
+            sxglobals.settings.shapeArray[-1],
             sxglobals.settings.tools['selectedLayer'])
 
     def applyTexture(self, texture, uvSetName, applyAlpha):
-        colors = []
-        color = []
-
         maya.cmds.polyUVSet(
             sxglobals.settings.shapeArray,
             currentUVSet=True,
@@ -760,47 +824,34 @@ class ToolActions(object):
                 sxglobals.settings.shapeArray, tv=True), fl=True)
 
         for component in components:
-            fvs = maya.cmds.ls(
-                maya.cmds.polyListComponentConversion(
-                    component, tvf=True), fl=True)
             uvs = maya.cmds.ls(
                 maya.cmds.polyListComponentConversion(
-                    fvs, tuv=True), fl=True)
-            for uv in uvs:
-                uvCoord = maya.cmds.polyEditUV(uv, query=True)
-                colors.append(
-                    maya.cmds.colorAtPoint(
-                        texture, o='RGBA', u=uvCoord[0], v=uvCoord[1]))
+                    component, tuv=True), fl=True)
+            if len(uvs) == 0:
+                continue
+
+            # query all uv coordinates of the vertex and
+            # sample the texture at all of them in one call
+            uvCoords = maya.cmds.polyEditUV(uvs, query=True)
+            samples = maya.cmds.colorAtPoint(
+                texture, o='RGBA', u=uvCoords[0::2], v=uvCoords[1::2])
+            colors = [samples[i:i+4] for i in xrange(0, len(samples), 4)]
+
+            # prefer an opaque sample
+            color = colors[-1]
             for tmpColor in colors:
                 if tmpColor[3] == 1:
                     color = tmpColor
 
+            # unpremultiply any sample with non-zero alpha
+            alpha = color[3]
+            if alpha > 0:
+                color = [channel / float(alpha) for channel in color[:3]]
             if not applyAlpha:
-                if 1 <= color[3] > 0:
-                    maya.cmds.polyColorPerVertex(
-                        component,
-                        r=color[0] / float(color[3]),
-                        g=color[1] / float(color[3]),
-                        b=color[2] / float(color[3]),
-                        a=1)
-                else:
-                    maya.cmds.polyColorPerVertex(
-                        component, r=color[0], g=color[1], b=color[2], a=1)
-            else:
-                if 1 <= color[3] > 0:
-                    maya.cmds.polyColorPerVertex(
-                        component,
-                        r=color[0] / float(color[3]),
-                        g=color[1] / float(color[3]),
-                        b=color[2] / float(color[3]),
-                        a=color[3])
-                else:
-                    maya.cmds.polyColorPerVertex(
-                        component,
-                        r=color[0],
-                        g=color[1],
-                        b=color[2],
-                        a=color[3])
+                alpha = 1
+
+            maya.cmds.polyColorPerVertex(
+                component, r=color[0], g=color[1], b=color[2], a=alpha)
 
         sxglobals.layers.refreshLayerList()
         sxglobals.layers.compositeLayers()
@@ -968,7 +1019,8 @@ class ToolActions(object):
         mod = OM.MDGModifier()
         colorRep = OM.MFnMesh.kRGBA
 
-        sxglobals.layers.setColorSet(sxglobals.settings.tools['selectedLayer'])
+        sxglobals.layers.setColorSet(layer)
+        rampLUT = self.getRampLUT()
 
         if len(sxglobals.settings.componentArray) > 0:
             # Convert component selection to face vertices,
@@ -994,9 +1046,6 @@ class ToolActions(object):
         selDagPath = OM.MDagPath()
         fVert = OM.MObject()
         fvColors = OM.MColorArray()
-        vtxIds = OM.MIntArray()
-        fvIds = OM.MIntArray()
-        faceIds = OM.MIntArray()
         compDagPath = OM.MDagPath()
 
         selectionIter = OM.MItSelectionList(selectionList)
@@ -1006,33 +1055,21 @@ class ToolActions(object):
             mesh = OM.MFnMesh(selDagPath)
             # fvColors.clear()
             fvColors = mesh.getFaceVertexColors(colorSet=layer)
-            selLen = len(fvColors)
-            vtxIds.setLength(selLen)
-            fvIds.setLength(selLen)
-            faceIds.setLength(selLen)
-
-            meshIter = OM.MItMeshFaceVertex(selDagPath)
-            i = 0
-            while not meshIter.isDone():
-                vtxIds[i] = meshIter.vertexId()
-                faceIds[i] = meshIter.faceId()
-                fvIds[i] = meshIter.faceVertexId()
-                i += 1
-                meshIter.next()
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(mesh)
 
             if selectionIter.hasComponents():
                 (compDagPath, fVert) = selectionIter.getComponent()
                 # Iterate through selected face vertices on current selection
-                fvIt = OM.MItMeshFaceVertex(selDagPath, fVert)
-                while not fvIt.isDone():
-                    faceId = fvIt.faceId()
-                    fvId = fvIt.faceVertexId()
-                    vtxId = fvIt.vertexId()
-                    for idx in xrange(selLen):
-                        if (faceId == faceIds[idx] and
-                           fvId == fvIds[idx] and
-                           vtxId == vtxIds[idx] and
-                           compDagPath == selDagPath):
+                if compDagPath == selDagPath:
+                    # map each face vertex to its index in fvColors
+                    fvIndices = dict(
+                        (fvKey, idx) for idx, fvKey in enumerate(
+                            zip(faceIds, fvIds, vtxIds)))
+                    fvIt = OM.MItMeshFaceVertex(selDagPath, fVert)
+                    while not fvIt.isDone():
+                        idx = fvIndices.get(
+                            (fvIt.faceId(), fvIt.faceVertexId(), fvIt.vertexId()))
+                        if idx is not None:
                             ratioRaw = None
                             ratio = None
                             fvPos = fvIt.position(space)
@@ -1049,21 +1086,18 @@ class ToolActions(object):
                                     (fvPos[2] - zmin) /
                                     float(zmax - zmin))
                             ratio = max(min(ratioRaw, 1), 0)
-                            outColor = maya.cmds.colorAtPoint(
-                                'SXRamp', o='RGB', u=(ratio), v=(ratio))
-                            outAlpha = maya.cmds.colorAtPoint(
-                                'SXAlphaRamp', o='A', u=(ratio), v=(ratio))
-                            if outAlpha[0] > 0:
+                            outColor = rampLUT[int(ratio * 255 + 0.5)]
+                            outAlpha = outColor[3]
+                            if outAlpha > 0:
                                 fvColors[idx].r = outColor[0]
                                 fvColors[idx].g = outColor[1]
                                 fvColors[idx].b = outColor[2]
                             else:
-                                fvColors[idx].r = outAlpha[0]
-                                fvColors[idx].g = outAlpha[0]
-                                fvColors[idx].b = outAlpha[0]
-                            fvColors[idx].a = outAlpha[0]
-                            break
-                    fvIt.next()
+                                fvColors[idx].r = outAlpha
+                                fvColors[idx].g = outAlpha
+                                fvColors[idx].b = outAlpha
+                            fvColors[idx].a = outAlpha
+                        fvIt.next()
             else:
                 fvIt = OM.MItMeshFaceVertex(selDagPath)
                 k = 0
@@ -1086,19 +1120,17 @@ class ToolActions(object):
                             (fvPos[2] - zmin) /
                             float(zmax - zmin))
                     ratio = max(min(ratioRaw, 1), 0)
-                    outColor = maya.cmds.colorAtPoint(
-                        'SXRamp', o='RGB', u=(ratio), v=(ratio))
-                    outAlpha = maya.cmds.colorAtPoint(
-                        'SXAlphaRamp', o='A', u=(ratio), v=(ratio))
-                    if outAlpha[0] > 0:
+                    outColor = rampLUT[int(ratio * 255 + 0.5)]
+                    outAlpha = outColor[3]
+                    if outAlpha > 0:
                         fvColors[k].r = outColor[0]
                         fvColors[k].g = outColor[1]
                         fvColors[k].b = outColor[2]
                     else:
-                        fvColors[k].r = outAlpha[0]
-                        fvColors[k].g = outAlpha[0]
-                        fvColors[k].b = outAlpha[0]
-                    fvColors[k].a = outAlpha[0]
+                        fvColors[k].r = outAlpha
+                        fvColors[k].g = outAlpha
+                        fvColors[k].b = outAlpha
+                    fvColors[k].a = outAlpha
                     k += 1
                     fvIt.next()
 
@@ -1137,9 +1169,6 @@ class ToolActions(object):
         selDagPath = OM.MDagPath()
         fVert = OM.MObject()
         fvColors = OM.MColorArray()
-        vtxIds = OM.MIntArray()
-        fvIds = OM.MIntArray()
-        faceIds = OM.MIntArray()
         compDagPath = OM.MDagPath()
 
         selectionIter = OM.MItSelectionList(selectionList)
@@ -1150,35 +1179,23 @@ class ToolActions(object):
             fvColors.clear()
             fvColors = mesh.getFaceVertexColors(colorSet=layer)
             selLen = len(fvColors)
-            vtxIds.setLength(selLen)
-            fvIds.setLength(selLen)
-            faceIds.setLength(selLen)
-
-            meshIter = OM.MItMeshFaceVertex(selDagPath)
-            i = 0
-            while not meshIter.isDone():
-                vtxIds[i] = meshIter.vertexId()
-                faceIds[i] = meshIter.faceId()
-                fvIds[i] = meshIter.faceVertexId()
-                i += 1
-                meshIter.next()
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(mesh)
 
             if selectionIter.hasComponents():
                 (compDagPath, fVert) = selectionIter.getComponent()
                 # Iterate through selected vertices on current selection
-                fvIt = OM.MItMeshFaceVertex(selDagPath, fVert)
-                while not fvIt.isDone():
-                    faceId = fvIt.faceId()
-                    fvId = fvIt.faceVertexId()
-                    vtxId = fvIt.vertexId()
-                    for idx in xrange(selLen):
-                        if (faceId == faceIds[idx] and
-                           fvId == fvIds[idx] and
-                           vtxId == vtxIds[idx] and
-                           compDagPath == selDagPath):
+                if compDagPath == selDagPath:
+                    # map each face vertex to its index in fvColors
+                    fvIndices = dict(
+                        (fvKey, idx) for idx, fvKey in enumerate(
+                            zip(faceIds, fvIds, vtxIds)))
+                    fvIt = OM.MItMeshFaceVertex(selDagPath, fVert)
+                    while not fvIt.isDone():
+                        idx = fvIndices.get(
+                            (fvIt.faceId(), fvIt.faceVertexId(), fvIt.vertexId()))
+                        if idx is not None:
                             fvColors[idx] = fillColor
-                            break
-                    fvIt.next()
+                        fvIt.next()
             else:
                 if palette:
                     for idx in xrange(selLen):
@@ -1191,18 +1208,16 @@ class ToolActions(object):
                             fvColors[idx].g = fillColor.g
                             fvColors[idx].b = fillColor.b
                 elif overwriteAlpha:
-                    for idx in xrange(selLen):
-                        fvColors[idx] = fillColor
+                    fvColors = OM.MColorArray(selLen, fillColor)
                 elif (not overwriteAlpha) and (sxglobals.settings.layerAlphaMax == 0):
-                    for idx in xrange(selLen):
-                        fvColors[idx] = fillColor
+                    fvColors = OM.MColorArray(selLen, fillColor)
                 elif ((not overwriteAlpha) and (sxglobals.settings.layerAlphaMax != 0)):
                     for idx in xrange(selLen):
                         fvColors[idx].r = fillColor.r
                         fvColors[idx].g = fillColor.g
                         fvColors[idx].b = fillColor.b
                 else:
-                    fvColors = [fillColor] * selLen
+                    fvColors = OM.MColorArray(selLen, fillColor)
 
             mesh.setFaceVertexColors(fvColors, faceIds, vtxIds, mod, colorRep)
             mod.doIt()
@@ -1250,28 +1265,26 @@ class ToolActions(object):
             mesh = OM.MFnMesh(selDagPath)
             vtxColors.clear()
             vtxColors = mesh.getVertexColors(colorSet=layer)
-            selLen = len(vtxColors)
-            vtxIds.setLength(selLen)
-            vtxPosArray.setLength(selLen)
             changedCols = OM.MColorArray()
             changedIds = OM.MIntArray()
 
-            meshIter = OM.MItMeshVertex(selDagPath)
-            while not meshIter.isDone():
-                i = meshIter.index()
-                vtxIds[i] = meshIter.index()
-                vtxPosArray[i] = meshIter.position()
-                meshIter.next()
-
             if selectionIter.hasComponents():
                 (compDagPath, vert) = selectionIter.getComponent()
                 # Iterate through selected vertices on current selection
-                vtxIt = OM.MItMeshVertex(selDagPath, vert)
-                while not vtxIt.isDone():
-                    vtxPos = vtxIt.position()
-                    for idx in xrange(selLen):
-                        if (vtxPos == vtxPosArray[idx] and
-                           compDagPath == selDagPath):
+                if compDagPath == selDagPath:
+                    # map vertex positions to the first vertex
+                    # index at that position
+                    vtxPosArray = mesh.getPoints()
+                    posIndices = {}
+                    for idx in xrange(len(vtxPosArray) - 1, -1, -1):
+                        vtxPos = vtxPosArray[idx]
+                        posIndices[(vtxPos.x, vtxPos.y, vtxPos.z)] = idx
+
+                    vtxIt = OM.MItMeshVertex(selDagPath, vert)
+                    while not vtxIt.isDone():
+                        vtxPos = vtxIt.position()
+                        idx = posIndices.get((vtxPos.x, vtxPos.y, vtxPos.z))
+                        if idx is not None:
                             if mono:
                                 randomOffset = 1 - random.uniform(0, value)
                                 vtxColors[idx].r *= randomOffset
@@ -1283,39 +1296,48 @@ class ToolActions(object):
                                 vtxColors[idx].b += random.uniform(-color[2]*value, color[2]*value)
                             changedCols.append(vtxColors[idx])
                             changedIds.append(idx)
-                            break
-                    vtxIt.next()
+                        vtxIt.next()
                 mesh.setVertexColors(changedCols, changedIds)
                 selectionIter.next()
             else:
                 vtxColors = OM.MColorArray()
                 vtxColors = mesh.getVertexColors(colorSet=layer)
-                vtxIds = OM.MIntArray()
 
                 lenSel = len(vtxColors)
-                vtxIds.setLength(lenSel)
-
-                vtxIt = OM.MItMeshVertex(selDagPath)
-                while not vtxIt.isDone():
-                    idx = vtxIt.index()
-                    vtxIds[idx] = vtxIt.index()
-                    if mono:
-                        randomOffset = 1 - random.uniform(0, value)
-                        vtxColors[idx].r *= randomOffset
-                        vtxColors[idx].g *= randomOffset
-                        vtxColors[idx].b *= randomOffset
-                    else:
-                        vtxColors[idx].r += random.uniform(-color[0]*value, color[0]*value)
-                        vtxColors[idx].g += random.uniform(-color[1]*value, color[1]*value)
-                        vtxColors[idx].b += random.uniform(-color[2]*value, color[2]*value)
-                    vtxIt.next()
+                vtxIds = OM.MIntArray(range(lenSel))
+
+                # every vertex is jittered, so walk the color
+                # array directly with the noise ranges bound once
+                uniform = random.uniform
+                MColor = OM.MColor
+                if mono:
+                    randomOffsets = [1 - uniform(0, value) for idx in xrange(lenSel)]
+                    vtxColors = OM.MColorArray([
+                        MColor((
+                            vtxColor.r * randomOffset,
+                            vtxColor.g * randomOffset,
+                            vtxColor.b * randomOffset,
+                            vtxColor.a))
+                        for vtxColor, randomOffset in zip(vtxColors, randomOffsets)])
+                else:
+                    rRange = color[0]*value
+                    gRange = color[1]*value
+                    bRange = color[2]*value
+                    vtxColors = OM.MColorArray([
+                        MColor((
+                            vtxColor.r + uniform(-rRange, rRange),
+                            vtxColor.g + uniform(-gRange, gRange),
+                            vtxColor.b + uniform(-bRange, bRange),
+                            vtxColor.a))
+                        for vtxColor in vtxColors])
                 mesh.setVertexColors(vtxColors, vtxIds)
                 selectionIter.next()
 
     def remapRamp(self):
         startTimeOcc = maya.cmds.timerX()
         layer = sxglobals.settings.tools['selectedLayer']
-        sxglobals.layers.setColorSet(sxglobals.settings.tools['selectedLayer'])
+        sxglobals.layers.setColorSet(layer)
+        rampLUT = self.getRampLUT()
         fvCol = OM.MColor()
 
         if len(sxglobals.settings.componentArray) > 0:
@@ -1333,9 +1355,6 @@ class ToolActions(object):
         selDagPath = OM.MDagPath()
         fVert = OM.MObject()
         fvColors = OM.MColorArray()
-        vtxIds = OM.MIntArray()
-        fvIds = OM.MIntArray()
-        faceIds = OM.MIntArray()
         compDagPath = OM.MDagPath()
 
         selectionIter = OM.MItSelectionList(selectionList)
@@ -1345,33 +1364,21 @@ class ToolActions(object):
             mesh = OM.MFnMesh(selDagPath)
             fvColors.clear()
             fvColors = mesh.getFaceVertexColors(colorSet=layer)
-            selLen = len(fvColors)
-            vtxIds.setLength(selLen)
-            fvIds.setLength(selLen)
-            faceIds.setLength(selLen)
-
-            meshIter = OM.MItMeshFaceVertex(selDagPath)
-            i = 0
-            while not meshIter.isDone():
-                vtxIds[i] = meshIter.vertexId()
-                faceIds[i] = meshIter.faceId()
-                fvIds[i] = meshIter.faceVertexId()
-                i += 1
-                meshIter.next()
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(mesh)
 
             if selectionIter.hasComponents():
                 (compDagPath, fVert) = selectionIter.getComponent()
                 # Iterate through selected facevertices on current selection
-                fvIt = OM.MItMeshFaceVertex(selDagPath, fVert)
-                while not fvIt.isDone():
-                    faceId = fvIt.faceId()
-                    fvId = fvIt.faceVertexId()
-                    vtxId = fvIt.vertexId()
-                    for idx in xrange(selLen):
-                        if (faceId == faceIds[idx] and
-                           fvId == fvIds[idx] and
-                           vtxId == vtxIds[idx] and
-                           compDagPath == selDagPath):
+                if compDagPath == selDagPath:
+                    # map each face vertex to its index in fvColors
+                    fvIndices = dict(
+                        (fvKey, idx) for idx, fvKey in enumerate(
+                            zip(faceIds, fvIds, vtxIds)))
+                    fvIt = OM.MItMeshFaceVertex(selDagPath, fVert)
+                    while not fvIt.isDone():
+                        idx = fvIndices.get(
+                            (fvIt.faceId(), fvIt.faceVertexId(), fvIt.vertexId()))
+                        if idx is not None:
                             fvCol = fvColors[idx]
                             luminance = ((fvCol.r +
                                           fvCol.r +
@@ -1379,37 +1386,20 @@ class ToolActions(object):
                                           fvCol.g +
                                           fvCol.g +
                                           fvCol.g) / float(6.0))
-                            outColor = maya.cmds.colorAtPoint(
-                                'SXRamp', o='RGB', u=luminance, v=luminance)
-                            outAlpha = maya.cmds.colorAtPoint(
-                                'SXAlphaRamp', o='A', u=luminance, v=luminance)
+                            outColor = rampLUT[min(max(int(luminance * 255 + 0.5), 0), 255)]
                             fvColors[idx].r = outColor[0]
                             fvColors[idx].g = outColor[1]
                             fvColors[idx].b = outColor[2]
-                            fvColors[idx].a = outAlpha[0]
-                            break
-                    fvIt.next()
+                            fvColors[idx].a = outColor[3]
+                        fvIt.next()
             else:
-                fvIt = OM.MItMeshFaceVertex(selDagPath)
-                k = 0
-                while not fvIt.isDone():
-                    fvCol = fvColors[k]
-                    luminance = ((fvCol.r +
-                                  fvCol.r +
-                                  fvCol.b +
-                                  fvCol.g +
-                                  fvCol.g +
-                                  fvCol.g) / float(6.0))
-                    outColor = maya.cmds.colorAtPoint(
-                        'SXRamp', o='RGB', u=luminance, v=luminance)
-                    outAlpha = maya.cmds.colorAtPoint(
-                        'SXAlphaRamp', o='A', u=luminance, v=luminance)
-                    fvColors[k].r = outColor[0]
-                    fvColors[k].g = outColor[1]
-                    fvColors[k].b = outColor[2]
-                    fvColors[k].a = outAlpha[0]
-                    k += 1
-                    fvIt.next()
+                # remap every face vertex into a new array in one pass
+                rampColors = [OM.MColor(color) for color in rampLUT]
+                fvColors = OM.MColorArray([
+                    rampColors[min(max(int(
+                        (fvCol.r + fvCol.r + fvCol.b +
+                         fvCol.g + fvCol.g + fvCol.g) / 6.0 * 255 + 0.5), 0), 255)]
+                    for fvCol in fvColors])
 
             mesh.setFaceVertexColors(fvColors, faceIds, vtxIds)
             selectionIter.next()
@@ -1426,10 +1416,10 @@ class ToolActions(object):
         layerB = sxglobals.settings.tools['targetLayer']
 
         if (layerA in refLayers) and (layerB in refLayers):
+            attrA = '.' + layerA + 'BlendMode'
+            attrB = '.' + layerB + 'BlendMode'
             for shape in shapes:
-                attrA = '.' + layerA + 'BlendMode'
                 modeA = maya.cmds.getAttr(str(shape) + attrA)
-                attrB = '.' + layerB + 'BlendMode'
 
                 selectionList = OM.MSelectionList()
                 selectionList.add(shape)
@@ -1440,29 +1430,13 @@ class ToolActions(object):
                 layerAColors = OM.MColorArray()
                 layerAColors = MFnMesh.getFaceVertexColors(colorSet=layerA)
 
+                # getFaceVertexColors returns a new array, so the
+                # layer B colors can be written back as they are
                 if mode == 2:
                     modeB = maya.cmds.getAttr(str(shape) + attrB)
-                    layerBColors = OM.MColorArray()
                     layerBColors = MFnMesh.getFaceVertexColors(colorSet=layerB)
-                    temp = OM.MColorArray()
-                    temp = layerBColors
-
-                faceIds = OM.MIntArray()
-                vtxIds = OM.MIntArray()
-
-                lenSel = len(layerAColors)
-
-                faceIds.setLength(lenSel)
-                vtxIds.setLength(lenSel)
 
-                fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-
-                k = 0
-                while not fvIt.isDone():
-                    faceIds[k] = fvIt.faceId()
-                    vtxIds[k] = fvIt.vertexId()
-                    k += 1
-                    fvIt.next()
+                faceIds, vtxIds, fvIds = self.getFaceVertexIds(MFnMesh)
 
                 maya.cmds.polyColorSet(shape, currentColorSet=True, colorSet=layerB)
                 MFnMesh.setFaceVertexColors(layerAColors, faceIds, vtxIds)
@@ -1471,7 +1445,7 @@ class ToolActions(object):
 
                 if mode == 2:
                     maya.cmds.polyColorSet(shape, currentColorSet=True, colorSet=layerA)
-                    MFnMesh.setFaceVertexColors(temp, faceIds, vtxIds)
+                    MFnMesh.setFaceVertexColors(layerBColors, faceIds, vtxIds)
 
                     maya.cmds.setAttr(str(shape) + attrA, modeB)
 
@@ -1484,7 +1458,7 @@ class ToolActions(object):
     # Updates tool title bar and returns active shading mode
     def verifyShadingMode(self):
         if len(sxglobals.settings.shapeArray) > 0:
-            obj = sxglobals.settings.shapeArray[len(sxglobals.settings.shapeArray)-1]
+            obj = sxglobals.settings.shapeArray[-1]
             mode = int(maya.cmds.getAttr(obj + '.shadingMode') + 1)
 
             objectLabel = (
@@ -1558,30 +1532,13 @@ class ToolActions(object):
             if '|' in objName:
                 objName = objName.rsplit('|', 1)[1]
 
-            for hist in reversed(histList):
-                if objName in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'assetsLayer' in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'exportsLayer' in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'sxCrease' in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'sxSubMesh' in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'set' in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'groupId' in str(hist):
-                    histList.remove(hist)
-            for hist in reversed(histList):
-                if 'topoSymmetrySet' in str(hist):
-                    histList.remove(hist)
+            # drop expected nodes in a single pass
+            ignored = (
+                objName, 'assetsLayer', 'exportsLayer', 'sxCrease',
+                'sxSubMesh', 'set', 'groupId', 'topoSymmetrySet')
+            histList = [
+                hist for hist in histList
+                if not any(token in str(hist) for token in ignored)]
 
             if len(histList) > 0:
                 print('SX Tools: History found: ' + str(histList))
@@ -1623,13 +1580,23 @@ class ToolActions(object):
 
     def setLayerOpacity(self):
         alphaMax = sxglobals.settings.layerAlphaMax
-        sxglobals.layers.setColorSet(sxglobals.settings.tools['selectedLayer'])
+        layer = sxglobals.settings.tools['selectedLayer']
+        sxglobals.layers.setColorSet(layer)
 
-        for shape in sxglobals.settings.shapeArray:
-            layer = sxglobals.settings.tools['selectedLayer']
-            sliderAlpha = maya.cmds.floatSlider(
-                'layerOpacitySlider', query=True, value=True)
+        sliderAlpha = maya.cmds.floatSlider(
+            'layerOpacitySlider', query=True, value=True)
+        if alphaMax != 0:
+            alphaScale = sliderAlpha / float(alphaMax)
+
+        # TODO: Support for transparency in layer1 with sw compositing
+        transparency = None
+        if str(layer) == 'layer1':
+            if sliderAlpha < 1:
+                transparency = 1
+            elif sliderAlpha == 1:
+                transparency = 0
 
+        for shape in sxglobals.settings.shapeArray:
             selectionList = OM.MSelectionList()
             selectionList.add(shape)
             nodeDagPath = OM.MDagPath()
@@ -1638,99 +1605,84 @@ class ToolActions(object):
 
             layerColorArray = OM.MColorArray()
             layerColorArray = MFnMesh.getFaceVertexColors(colorSet=layer)
-            faceIds = OM.MIntArray()
-            vtxIds = OM.MIntArray()
-
-            testColor = OM.MColor()
-
-            lenSel = len(layerColorArray)
-
-            faceIds.setLength(lenSel)
-            vtxIds.setLength(lenSel)
-
-            fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-
-            k = 0
-            while not fvIt.isDone():
-                faceIds[k] = fvIt.faceId()
-                vtxIds[k] = fvIt.vertexId()
-                testColor = fvIt.getColor(layer)
-                if ((alphaMax == 0) and
-                    (testColor.r > 0 or
-                     testColor.g > 0 or
-                     testColor.b > 0)):
-                    layerColorArray[k].a = sliderAlpha
-                elif (testColor.a > 0 or
-                      testColor.r > 0 or
-                      testColor.g > 0 or
-                      testColor.b > 0):
-                        layerColorArray[k].a = (layerColorArray[k].a /
-                                                alphaMax * sliderAlpha)
-                k += 1
-                fvIt.next()
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(MFnMesh)
+
+            # test the fetched layer colors directly,
+            # only painted face vertices are changed
+            if alphaMax == 0:
+                for k in xrange(len(layerColorArray)):
+                    testColor = layerColorArray[k]
+                    if (testColor.r > 0 or
+                       testColor.g > 0 or
+                       testColor.b > 0):
+                        testColor.a = sliderAlpha
+            else:
+                for k in xrange(len(layerColorArray)):
+                    testColor = layerColorArray[k]
+                    if (testColor.a > 0 or
+                       testColor.r > 0 or
+                       testColor.g > 0 or
+                       testColor.b > 0):
+                        testColor.a = testColor.a * alphaScale
 
             MFnMesh.setFaceVertexColors(layerColorArray, faceIds, vtxIds)
 
-            # TODO: Support for transparency in layer1 with sw compositing
-            if (str(layer) == 'layer1') and (sliderAlpha < 1):
-                maya.cmds.setAttr(str(shape) + '.transparency', 1)
-                if alphaMax == 1:
-                    maya.cmds.shaderfx(
-                        sfxnode='SXShader',
-                        makeConnection=(
-                            sxglobals.settings.nodeDict['transparencyComp'], 0,
-                            sxglobals.settings.nodeDict['SXShader'], 0))
-                # maya.cmds.shaderfx(sfxnode='SXShader', update=True)
-            elif (str(layer) == 'layer1') and (sliderAlpha == 1):
-                maya.cmds.setAttr(str(shape) + '.transparency', 0)
-                if alphaMax < 1:
-                    maya.cmds.shaderfx(
-                        sfxnode='SXShader',
-                        breakConnection=(
-                            sxglobals.settings.nodeDict['transparencyComp'], 0,
-                            sxglobals.settings.nodeDict['SXShader'], 0))
-                # maya.cmds.shaderfx(sfxnode='SXShader', update=True)
-
-        sxglobals.layers.getLayerPaletteAndOpacity(
-            sxglobals.settings.shapeArray[len(sxglobals.settings.shapeArray)-1],
-            sxglobals.settings.tools['selectedLayer'])
+            if transparency is not None:
+                maya.cmds.setAttr(str(shape) + '.transparency', transparency)
+
+        # The shader is shared by all shapes,
+        # so the graph is only edited once
+        if transparency == 1:
+            if alphaMax == 1:
+                maya.cmds.shaderfx(
+                    sfxnode='SXShader',
+                    makeConnection=(
+                        sxglobals.settings.nodeDict['transparencyComp'], 0,
+                        sxglobals.settings.nodeDict['SXShader'], 0))
+            # maya.cmds.shaderfx(sfxnode='SXShader', update=True)
+        elif transparency == 0:
+            if alphaMax < 1:
+                maya.cmds.shaderfx(
+                    sfxnode='SXShader',
+                    breakConnection=(
+                        sxglobals.settings.nodeDict['transparencyComp'], 0,
+                        sxglobals.settings.nodeDict['SXShader'], 0))
+            # maya.cmds.shaderfx(sfxnode='SXShader', update=True)
 
     def getLayerMask(self):
         maskList = []
-
-        sxglobals.layers.setColorSet(sxglobals.settings.tools['selectedLayer'])
-
-        vertFaceList = maya.cmds.ls(
-            maya.cmds.polyListComponentConversion(
-                sxglobals.settings.shapeArray, tvf=True), fl=True)
+        layer = sxglobals.settings.tools['selectedLayer']
+        sxglobals.layers.setColorSet(layer)
 
         modifiers = maya.cmds.getModifiers()
         shift = bool((modifiers & 1) > 0)
 
-        if ((sxglobals.settings.tools['selectedLayer'] == 'metallic') or
-            (sxglobals.settings.tools['selectedLayer'] == 'transmission') or
-            (sxglobals.settings.tools['selectedLayer'] == 'emission')):
-            if shift:
-                for vertFace in vertFaceList:
-                    if maya.cmds.polyColorPerVertex(
-                       vertFace, query=True, r=True)[0] == 0:
-                        maskList.append(vertFace)
-            elif not shift:
-                for vertFace in vertFaceList:
-                    if maya.cmds.polyColorPerVertex(
-                       vertFace, query=True, r=True)[0] > 0:
-                        maskList.append(vertFace)
-        else:
+        # material channels store the mask in red
+        maskRed = layer in ('metallic', 'transmission', 'emission')
+
+        # read each layer in one call and name
+        # the matching face vertices directly
+        for shape in sxglobals.settings.shapeArray:
+            nodeDagPath, MFnMesh = self.getMeshFn(shape)
+            layerColorArray = MFnMesh.getFaceVertexColors(colorSet=layer)
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(MFnMesh)
+
+            if maskRed:
+                maskValues = [color.r for color in layerColorArray]
+            else:
+                maskValues = [color.a for color in layerColorArray]
+
+            vtxFaceName = str(shape) + '.vtxFace[%d][%d]'
             if shift:
-                for vertFace in vertFaceList:
-                    if maya.cmds.polyColorPerVertex(
-                       vertFace, query=True, a=True)[0] == 0:
-                        maskList.append(vertFace)
-            elif not shift:
-                for vertFace in vertFaceList:
-                    if maya.cmds.polyColorPerVertex(
-                       vertFace, query=True, a=True)[0] > 0:
-                        maskList.append(vertFace)
+                maskList.extend([
+                    vtxFaceName % (vtxId, faceId)
+                    for vtxId, faceId, value in zip(vtxIds, faceIds, maskValues)
+                    if value == 0])
+            else:
+                maskList.extend([
+                    vtxFaceName % (vtxId, faceId)
+                    for vtxId, faceId, value in zip(vtxIds, faceIds, maskValues)
+                    if value > 0])
 
         if len(maskList) == 0:
             print('SX Tools: No layer mask found')
@@ -1779,14 +1731,15 @@ class ToolActions(object):
     def updateRecentPalette(self):
         addedColor = maya.cmds.colorSliderGrp(
             'sxApplyColor', query=True, rgbValue=True)
-        swapColorArray = []
+        swapColorArray = [None] * 8
 
-        for k in range(0, 7):
+        # read the cells backwards to leave the first one selected
+        for k in range(7, -1, -1):
             maya.cmds.palettePort('recentPalette', edit=True, scc=k)
-            swapColorArray.append(
-                maya.cmds.palettePort('recentPalette', query=True, rgb=True))
+            swapColorArray[k] = maya.cmds.palettePort(
+                'recentPalette', query=True, rgb=True)
 
-        if not addedColor in swapColorArray:
+        if not addedColor in swapColorArray[:7]:
             for k in range(7, 0, -1):
                 maya.cmds.palettePort(
                     'recentPalette',
@@ -1797,9 +1750,6 @@ class ToolActions(object):
                         swapColorArray[k - 1][1],
                         swapColorArray[k - 1][2]))
 
-            maya.cmds.palettePort(
-                'recentPalette',
-                edit=True, scc=0)
             maya.cmds.palettePort(
                 'recentPalette',
                 edit=True,
@@ -1811,16 +1761,16 @@ class ToolActions(object):
             maya.cmds.palettePort(
                 'recentPalette',
                 edit=True, redraw=True)
+            swapColorArray = [addedColor] + swapColorArray[:7]
         else:
             idx = swapColorArray.index(addedColor)
             maya.cmds.palettePort(
                 'recentPalette',
                 edit=True, scc=idx)
 
-        self.storePalette(
-            'recentPalette',
-            sxglobals.settings.paletteDict,
-            'SXToolsRecentPalette')
+        # all cells are already known, store them
+        # without querying the palette again
+        sxglobals.settings.paletteDict['SXToolsRecentPalette'] = swapColorArray
 
     def storePalette(self, paletteUI, category, preset):
         currentCell = maya.cmds.palettePort(
@@ -1831,34 +1781,39 @@ class ToolActions(object):
             paletteUI,
             query=True,
             actualTotal=True)
-        paletteArray = []
-        for i in range(0, paletteLength):
-            maya.cmds.palettePort(
-                paletteUI,
-                edit=True,
-                scc=i)
-            paletteArray.append(
+        # palettePort only reports the selected cell, so read
+        # the current cell first and select the others in turn
+        cellOrder = sorted(
+            range(0, paletteLength), key=lambda i: i != currentCell)
+        paletteArray = [None] * paletteLength
+        for i in cellOrder:
+            if i != currentCell:
                 maya.cmds.palettePort(
                     paletteUI,
-                    query=True,
-                    rgb=True))
+                    edit=True,
+                    scc=i)
+            paletteArray[i] = maya.cmds.palettePort(
+                paletteUI,
+                query=True,
+                rgb=True)
 
         if category == sxglobals.settings.paletteDict:
             category[preset] = paletteArray
         elif 'Palette' in paletteUI:
-            for i, cat in enumerate(sxglobals.settings.masterPaletteArray):
-                if cat.keys()[0] == category:
-                    sxglobals.settings.masterPaletteArray[i][
-                        category][preset] = paletteArray
+            presets = self.getCategory(
+                sxglobals.settings.masterPaletteArray, category)
+            if presets is not None:
+                presets[preset] = paletteArray
         elif 'Material' in paletteUI:
-            for i, cat in enumerate(sxglobals.settings.materialArray):
-                if cat.keys()[0] == category:
-                    sxglobals.settings.materialArray[i][
-                        category][preset] = paletteArray
-        maya.cmds.palettePort(
-            paletteUI,
-            edit=True,
-            scc=currentCell)
+            presets = self.getCategory(
+                sxglobals.settings.materialArray, category)
+            if presets is not None:
+                presets[preset] = paletteArray
+        if len(cellOrder) > 0 and cellOrder[-1] != currentCell:
+            maya.cmds.palettePort(
+                paletteUI,
+                edit=True,
+                scc=currentCell)
 
     def getPalette(self, paletteUI, category, preset):
         if (category == sxglobals.settings.paletteDict):
@@ -1867,15 +1822,11 @@ class ToolActions(object):
             else:
                 return
         elif 'Palette' in paletteUI:
-            for i, cat in enumerate(sxglobals.settings.masterPaletteArray):
-                if cat.keys()[0] == category:
-                    presetColors = sxglobals.settings.masterPaletteArray[i][
-                        category][preset]
+            presetColors = self.getCategory(
+                sxglobals.settings.masterPaletteArray, category)[preset]
         elif 'Material' in paletteUI:
-            for i, cat in enumerate(sxglobals.settings.materialArray):
-                if cat.keys()[0] == category:
-                    presetColors = sxglobals.settings.materialArray[i][
-                        category][preset]
+            presetColors = self.getCategory(
+                sxglobals.settings.materialArray, category)[preset]
 
         for idx, color in enumerate(presetColors):
             maya.cmds.palettePort(
@@ -1884,27 +1835,37 @@ class ToolActions(object):
                 rgb=(idx, color[0], color[1], color[2]))
         maya.cmds.palettePort(paletteUI, edit=True, redraw=True)
 
+    # Palette and material categories are stored as a list of
+    # single-key dicts to keep their order in the saved files
+    def getCategory(self, categoryArray, category):
+        for categoryDict in categoryArray:
+            if category in categoryDict:
+                return categoryDict[category]
+        return None
+
     def deleteCategory(self, category):
-        for i, cat in enumerate(sxglobals.settings.masterPaletteArray):
-            if cat.keys()[0] == category:
-                sxglobals.settings.masterPaletteArray.pop(i)
+        sxglobals.settings.masterPaletteArray[:] = [
+            cat for cat in sxglobals.settings.masterPaletteArray
+            if category not in cat]
         sxglobals.settings.tools['categoryPreset'] = None
 
     def deleteMaterialCategory(self, category):
-        for i, cat in enumerate(sxglobals.settings.materialArray):
-            if cat.keys()[0] == category:
-                sxglobals.settings.materialArray.pop(i)
+        sxglobals.settings.materialArray[:] = [
+            cat for cat in sxglobals.settings.materialArray
+            if category not in cat]
         sxglobals.settings.tools['materialCategoryPreset'] = None
 
     def deletePalette(self, category, preset):
-        for i, cat in enumerate(sxglobals.settings.masterPaletteArray):
-            if cat.keys()[0] == category:
-                sxglobals.settings.masterPaletteArray[i][category].pop(preset)
+        presets = self.getCategory(
+            sxglobals.settings.masterPaletteArray, category)
+        if presets is not None:
+            presets.pop(preset)
 
     def deleteMaterial(self, category, preset):
-        for i, cat in enumerate(sxglobals.settings.materialArray):
-            if cat.keys()[0] == category:
-                sxglobals.settings.materialArray[i][category].pop(preset)
+        presets = self.getCategory(
+            sxglobals.settings.materialArray, category)
+        if presets is not None:
+            presets.pop(preset)
 
     def saveMasterCategory(self):
         modifiers = maya.cmds.getModifiers()
@@ -1939,11 +1900,8 @@ class ToolActions(object):
                     category,
                     label=category,
                     parent='masterCategories')
-                itemList = maya.cmds.optionMenu(
-                    'masterCategories',
-                    query=True,
-                    ils=True)
-                idx = itemList.index(category) + 1
+                # the new category is the last menu item
+                idx = len(itemList or []) + 1
                 sxglobals.settings.tools['categoryPreset'] = idx
                 maya.cmds.optionMenu(
                     'masterCategories',
@@ -1987,11 +1945,8 @@ class ToolActions(object):
                     category,
                     label=category,
                     parent='materialCategories')
-                itemList = maya.cmds.optionMenu(
-                    'materialCategories',
-                    query=True,
-                    ils=True)
-                idx = itemList.index(category) + 1
+                # the new category is the last menu item
+                idx = len(itemList or []) + 1
                 sxglobals.settings.tools['materialCategoryPreset'] = idx
                 maya.cmds.optionMenu(
                     'materialCategories',
@@ -2060,37 +2015,35 @@ class ToolActions(object):
         else:
             print('SX Tools Error: Invalid preset name!')
 
+    # The preset colors are copied directly instead of
+    # reading them back from the palette cells they were
+    # just written to
     def setMasterPalette(self, category, preset):
         self.getPalette(
             'newPalette',
             category,
             preset)
-        self.storePalette(
-            'newPalette',
-            sxglobals.settings.paletteDict,
-            'SXToolsMasterPalette')
+        presetColors = self.getCategory(
+            sxglobals.settings.masterPaletteArray, category)[preset]
+        sxglobals.settings.paletteDict['SXToolsMasterPalette'] = [
+            list(color) for color in presetColors]
 
     def setMaterialPalette(self, category, preset):
         self.getPalette(
             'newMaterial',
             category,
             preset)
-        self.storePalette(
-            'newMaterial',
-            sxglobals.settings.paletteDict,
-            'SXToolsMaterialPalette')
+        presetColors = self.getCategory(
+            sxglobals.settings.materialArray, category)[preset]
+        sxglobals.settings.paletteDict['SXToolsMaterialPalette'] = [
+            list(color) for color in presetColors]
 
     def checkTarget(self, targets, index):
-        refLayers = sxglobals.layers.sortLayers(
-            sxglobals.settings.project['LayerData'].keys())
+        refLayers = sxglobals.layers.refLayerSet()
 
-        splitList = []
-        targetList = []
-        splitList = targets.split(',')
-        for item in splitList:
-            targetList.append(item.strip())
+        targetList = [item.strip() for item in targets.split(',')]
 
-        if not set(targetList).issubset(refLayers):
+        if not refLayers.issuperset(targetList):
             print('SX Tools Error: Invalid layer target!')
             maya.cmds.textField(
                 'masterTarget'+str(index),
@@ -2101,23 +2054,26 @@ class ToolActions(object):
         sxglobals.settings.saveFile(0)
 
     def gradientToolManager(self, mode):
-        modifiers = maya.cmds.getModifiers()
-        shift = bool((modifiers & 1) > 0)
+        # only the preset and curvature modes use modifiers
+        shift = False
+        if (mode == 'preset') or (mode == 5):
+            modifiers = maya.cmds.getModifiers()
+            shift = bool((modifiers & 1) > 0)
 
         if mode == 'load':
             self.clearRamp('SXRamp')
             self.clearRamp('SXAlphaRamp')
             name = maya.cmds.optionMenu('rampPresets', query=True, value=True)
-            alphaName = maya.cmds.optionMenu('rampPresets', query=True, value=True) + '_Alpha'
+            alphaName = name + '_Alpha'
             maya.cmds.nodePreset(load=('SXRamp', name))
             maya.cmds.nodePreset(load=('SXAlphaRamp', alphaName))
         elif mode == 'preset' and shift:
             presetNameArray = maya.cmds.nodePreset(list='SXRamp')
             if len(presetNameArray) > 0:
-                maya.cmds.nodePreset(delete=('SXRamp', maya.cmds.optionMenu(
-                    'rampPresets', query=True, value=True)))
-                maya.cmds.nodePreset(delete=('SXAlphaRamp', maya.cmds.optionMenu(
-                    'rampPresets', query=True, value=True) + '_Alpha'))
+                name = maya.cmds.optionMenu(
+                    'rampPresets', query=True, value=True)
+                maya.cmds.nodePreset(delete=('SXRamp', name))
+                maya.cmds.nodePreset(delete=('SXAlphaRamp', name + '_Alpha'))
                 if len(presetNameArray) > 1:
                     sxglobals.settings.tools['gradientPreset'] = 1
                 else:
@@ -2127,8 +2083,7 @@ class ToolActions(object):
         elif mode == 'preset' and not shift:
             name = maya.cmds.textField(
                 'presetName', query=True, text=True).replace(' ', '_')
-            alphaName = maya.cmds.textField(
-                'presetName', query=True, text=True).replace(' ', '_') + '_Alpha'
+            alphaName = name + '_Alpha'
             if len(name) > 0:
                 maya.cmds.nodePreset(save=('SXRamp', name))
                 maya.cmds.nodePreset(save=('SXAlphaRamp', alphaName))
@@ -2157,11 +2112,10 @@ class ToolActions(object):
 
     def clearRamp(self, rampName):
         indexList = maya.cmds.getAttr(
-            rampName + '.colorEntryList', multiIndices=True)
+            rampName + '.colorEntryList', multiIndices=True) or []
+        entryName = rampName + '.colorEntryList[%d]'
         for index in indexList:
-            index = str(index).split('L')[-1]
-            maya.cmds.removeMultiInstance(
-                rampName + '.colorEntryList[' + index + ']')
+            maya.cmds.removeMultiInstance(entryName % index)
 
     def setLayerBlendMode(self):
         mode = maya.cmds.optionMenu(
@@ -2172,7 +2126,6 @@ class ToolActions(object):
         for shape in sxglobals.settings.shapeArray:
             maya.cmds.setAttr(str(shape) + attr, mode)
 
-        #sxglobals.layers.setSelectedLayer()
         sxglobals.layers.compositeLayers()
 
     def swapLayerSets(self, objects, targetSet, offset=False):
@@ -2181,43 +2134,69 @@ class ToolActions(object):
         if (targetSet > sxglobals.layers.getLayerSets(objects[0])) or (targetSet < 0):
             print('SX Tools Error: Selected layer set does not exist!')
             return
-        refLayers = sxglobals.layers.sortLayers(
-            sxglobals.settings.project['LayerData'].keys())
+        refLayers = list(sxglobals.layers.sortedRefLayers())
         refLayers.remove('composite')
 
-        for object in objects:
+        # commands called per layer and group
+        polyColorSet = maya.cmds.polyColorSet
+        getAttr = maya.cmds.getAttr
+        setAttr = maya.cmds.setAttr
+
+        # suspend redraws and collect the edits into one undo step
+        maya.cmds.undoInfo(openChunk=True)
+        maya.cmds.refresh(suspend=True)
+        try:
+            # group objects by their active layer set,
+            # each color set edit then covers a whole group
             attr = '.activeLayerSet'
-            currentMode = int(maya.cmds.getAttr(object + attr))
-            objLayers = maya.cmds.polyColorSet(
-                object,
-                query=True,
-                allColorSets=True)
-            for layer in refLayers:
-                if (str(layer)+'_var'+str(currentMode)) in objLayers:
-                    maya.cmds.polyColorSet(
+            modeObjects = {}
+            for object in objects:
+                currentMode = int(getAttr(object + attr))
+                modeObjects.setdefault(currentMode, []).append(object)
+
+            targetSuffix = '_var' + str(targetSet)
+            for currentMode, modeGroup in modeObjects.iteritems():
+                currentSuffix = '_var' + str(currentMode)
+                # color set names are hashed once per object
+                objLayers = {}
+                for object in modeGroup:
+                    objLayers[object] = set(polyColorSet(
                         object,
-                        delete=True,
-                        colorSet=(str(layer)+'_var'+str(currentMode)))
-                maya.cmds.polyColorSet(
-                    object,
-                    rename=True,
-                    colorSet=layer,
-                    newColorSet=(str(layer)+'_var'+str(currentMode)))
-                maya.cmds.polyColorSet(
-                    object,
-                    rename=True,
-                    colorSet=(
-                        str(layer)+'_var'+str(targetSet)),
-                    newColorSet=layer)
-            maya.cmds.setAttr(object + attr, targetSet)
+                        query=True,
+                        allColorSets=True))
+                for layer in refLayers:
+                    currentSet = layer + currentSuffix
+                    oldSets = [
+                        object for object in modeGroup
+                        if currentSet in objLayers[object]]
+                    if len(oldSets) > 0:
+                        polyColorSet(
+                            oldSets,
+                            delete=True,
+                            colorSet=currentSet)
+                    polyColorSet(
+                        modeGroup,
+                        rename=True,
+                        colorSet=layer,
+                        newColorSet=currentSet)
+                    polyColorSet(
+                        modeGroup,
+                        rename=True,
+                        colorSet=layer + targetSuffix,
+                        newColorSet=layer)
+                for object in modeGroup:
+                    setAttr(object + attr, targetSet)
 
-        maya.cmds.polyColorSet(
-            objects,
-            currentColorSet=True,
-            colorSet='layer1')
+            maya.cmds.polyColorSet(
+                objects,
+                currentColorSet=True,
+                colorSet='layer1')
+        finally:
+            maya.cmds.refresh(suspend=False)
+            maya.cmds.undoInfo(closeChunk=True)
 
         # self.getLayerPaletteAndOpacity(
-        #     sxglobals.settings.shapeArray[len(sxglobals.settings.shapeArray)-1],
+        #     sxglobals.settings.shapeArray[-1],
         #     sxglobals.settings.tools['selectedLayer'])
         # sxglobals.layers.refreshLayerList()
         # sxglobals.export.compositeLayers()
@@ -2230,27 +2209,22 @@ class ToolActions(object):
         if shift:
             sxglobals.layers.clearLayerSets()
         else:
-            refLayers = sxglobals.layers.sortLayers(
-                sxglobals.settings.project['LayerData'].keys())
+            refLayers = list(sxglobals.layers.sortedRefLayers())
             refLayers.remove('composite')
-            actives = []
-            numSets = []
             active = None
             num = None
             target = None
             previous = None
+            # stop at the first object with different layer sets
             for object in objects:
-                actives.append(
-                    int(maya.cmds.getAttr(object + '.activeLayerSet')))
-                numSets.append(
-                    int(maya.cmds.getAttr(object + '.numLayerSets')))
-            if (not (all(active == actives[0] for active in actives)) or
-               not (all(num == numSets[0] for num in numSets))):
-                print('SX Tools Error: Selection with mismatching Layer Sets!')
-                return
-
-            active = actives[0]
-            num = numSets[0]
+                objActive = int(maya.cmds.getAttr(object + '.activeLayerSet'))
+                objNum = int(maya.cmds.getAttr(object + '.numLayerSets'))
+                if active is None:
+                    active = objActive
+                    num = objNum
+                elif (objActive != active) or (objNum != num):
+                    print('SX Tools Error: Selection with mismatching Layer Sets!')
+                    return
             if (active == 0) and (num == 0):
                 print('SX Tools Error: Objects must have one Layer Set')
                 return
@@ -2264,16 +2238,17 @@ class ToolActions(object):
 
             self.swapLayerSets(objects, target)
 
+            previousSuffix = '_var' + str(previous)
             for layer in refLayers:
                 maya.cmds.polyColorSet(
                     objects,
                     delete=True,
-                    colorSet=(str(layer)+'_var'+str(previous)))
+                    colorSet=layer + previousSuffix)
 
+            # all objects were checked to share the same count
             attr = '.numLayerSets'
             for object in objects:
-                maya.cmds.setAttr(
-                    object + attr, (maya.cmds.getAttr(object + attr) - 1))
+                maya.cmds.setAttr(object + attr, num - 1)
 
             objLayers = maya.cmds.polyColorSet(
                 objects[0],
@@ -2283,98 +2258,85 @@ class ToolActions(object):
             if previous == 0:
                 for object in objects:
                     maya.cmds.setAttr(object + '.activeLayerSet', 0)
-                for layer in objLayers:
-                    if '_var' in layer:
-                        currentIndex = int(layer[-1])
-                        newSet = str(layer).split(
-                            '_var')[0]+'_var'+str(currentIndex-1)
-                        maya.cmds.polyColorSet(
-                            objects,
-                            rename=True,
-                            colorSet=layer,
-                            newColorSet=newSet)
-            else:
-                for layer in objLayers:
-                    if ('_var' in layer) and (int(layer[-1]) > previous):
-                        currentIndex = int(layer[-1])
-                        newSet = str(layer).split(
-                            '_var')[0]+'_var'+str(currentIndex-1)
-                        maya.cmds.polyColorSet(
-                            objects,
-                            rename=True,
-                            colorSet=layer,
-                            newColorSet=newSet)
+
+            # split each _var set once into its base name and
+            # index, rpartition keeps multi-digit indices intact
+            varLayers = [
+                (layer, prefix, int(tail))
+                for layer, (prefix, sep, tail) in (
+                    (layer, layer.rpartition('_var')) for layer in objLayers)
+                if sep]
+            for layer, prefix, index in varLayers:
+                if index > previous:
+                    maya.cmds.polyColorSet(
+                        objects,
+                        rename=True,
+                        colorSet=layer,
+                        newColorSet='%s_var%d' % (prefix, index - 1))
 
     def copyFaceVertexColors(self, objects, sourceLayers, targetLayers):
         for object in objects:
-            selectionList = OM.MSelectionList()
-            selectionList.add(object)
-            nodeDagPath = OM.MDagPath()
-            nodeDagPath = selectionList.getDagPath(0)
-            MFnMesh = OM.MFnMesh(nodeDagPath)
-
-            layerAColors = OM.MColorArray()
-            layerAColors = MFnMesh.getFaceVertexColors(colorSet='layer1')
-
-            faceIds = OM.MIntArray()
-            vtxIds = OM.MIntArray()
-
-            lenSel = len(layerAColors)
-
-            faceIds.setLength(lenSel)
-            vtxIds.setLength(lenSel)
-
-            fvIt = OM.MItMeshFaceVertex(nodeDagPath)
-
-            k = 0
-            while not fvIt.isDone():
-                faceIds[k] = fvIt.faceId()
-                vtxIds[k] = fvIt.vertexId()
-                k += 1
-                fvIt.next()
-
-            for source, target in zip(sourceLayers, targetLayers):
+            nodeDagPath, MFnMesh = self.getMeshFn(object)
+
+            # setFaceVertexColors in API 2.0 has no form without
+            # id arrays, so they are built once and shared by
+            # all copied layers
+            faceIds, vtxIds, fvIds = self.getFaceVertexIds(MFnMesh)
+
+            # read all sources before writing, the targets are
+            # new layer set copies and never one of the sources
+            sourceColors = [
+                MFnMesh.getFaceVertexColors(colorSet=source)
+                for source in sourceLayers]
+            for target, layerAColors in zip(targetLayers, sourceColors):
                 maya.cmds.polyColorSet(
                     object,
                     currentColorSet=True,
                     colorSet=target)
-                layerAColors = MFnMesh.getFaceVertexColors(colorSet=source)
                 MFnMesh.setFaceVertexColors(layerAColors, faceIds, vtxIds)
 
     def createSkinMesh(self, objects):
-        skinMeshArray = []
-        for obj in objects:
-            skinMesh = maya.cmds.duplicate(
-                obj, renameChildren=True, name=obj+'_skinned')
-            skinShape = maya.cmds.listRelatives(
-                skinMesh,
-                type='mesh',
-                allDescendents=True,
-                fullPath=True)
-            sxglobals.export.stripPrimVars(skinShape)
-            maya.cmds.setAttr(
-                skinMesh[0] + '.translate',
-                0, 0, 0, type='double3')
-            maya.cmds.makeIdentity(
-                skinMesh, apply=True, t=1, r=1, s=1, n=0, pn=1)
-            if maya.cmds.attributeQuery('staticVertexColors', node=skinMesh[0], exists=True):
-                maya.cmds.deleteAttr(skinMesh[0]+'.staticVertexColors')
-            if maya.cmds.attributeQuery('subdivisionLevel', node=skinMesh[0], exists=True):
-                maya.cmds.deleteAttr(skinMesh[0]+'.subdivisionLevel')
-            maya.cmds.addAttr(
-                skinMesh,
-                ln='skinnedMesh',
-                at='bool',
-                dv=True)
-            colSets = maya.cmds.polyColorSet(
-                skinMesh,
-                query=True, allColorSets=True)
-            for set in colSets:
-                if str(set) != 'layer1':
-                    maya.cmds.polyColorSet(
-                        skinMesh,
-                        delete=True, colorSet=str(set))
-                else:
+        # suspend redraws and collect the edits into one undo step
+        maya.cmds.undoInfo(openChunk=True)
+        maya.cmds.refresh(suspend=True)
+        try:
+            skinMeshArray = []
+            for obj in objects:
+                skinMesh = maya.cmds.duplicate(
+                    obj, renameChildren=True, name=obj+'_skinned')
+                skinShape = maya.cmds.listRelatives(
+                    skinMesh,
+                    type='mesh',
+                    allDescendents=True,
+                    fullPath=True)
+                sxglobals.export.stripPrimVars(skinShape)
+                maya.cmds.setAttr(
+                    skinMesh[0] + '.translate',
+                    0, 0, 0, type='double3')
+                maya.cmds.makeIdentity(
+                    skinMesh, apply=True, t=1, r=1, s=1, n=0, pn=1)
+                # one query lists the export flags to strip
+                userAttrs = set(maya.cmds.listAttr(
+                    skinMesh[0], userDefined=True) or [])
+                if 'staticVertexColors' in userAttrs:
+                    maya.cmds.deleteAttr(skinMesh[0]+'.staticVertexColors')
+                if 'subdivisionLevel' in userAttrs:
+                    maya.cmds.deleteAttr(skinMesh[0]+'.subdivisionLevel')
+                maya.cmds.addAttr(
+                    skinMesh,
+                    ln='skinnedMesh',
+                    at='bool',
+                    dv=True)
+                colSets = maya.cmds.polyColorSet(
+                    skinMesh,
+                    query=True, allColorSets=True) or []
+                # polyColorSet deletes one set per call
+                for set in colSets:
+                    if str(set) != 'layer1':
+                        maya.cmds.polyColorSet(
+                            skinMesh,
+                            delete=True, colorSet=str(set))
+                if 'layer1' in colSets:
                     maya.cmds.polyColorSet(
                         skinMesh,
                         currentColorSet=True,
@@ -2386,35 +2348,39 @@ class ToolActions(object):
                         b=0.5,
                         a=1,
                         representation=4)
-            name = maya.cmds.getAttr(
-                skinMesh[0] + '.uvSet[0].uvSetName')
-            maya.cmds.polyUVSet(
-                skinMesh,
-                rename=True,
-                uvSet=name, newUVSet='UV0')
-            maya.cmds.polyUVSet(
-                skinMesh,
-                currentUVSet=True, uvSet='UV0')
-            maya.cmds.polyAutoProjection(
-                skinMesh,
-                lm=0, pb=0, ibd=1, cm=0, l=3,
-                sc=1, o=0, p=6, ps=0.2, ws=0)
-            maya.cmds.setAttr(skinMesh[0] + '.outlinerColor', 0.75, 0.25, 1)
-            maya.cmds.setAttr(skinMesh[0] + '.useOutlinerColor', True)
-            skinMeshArray.append(skinMesh[0])
-
-        maya.cmds.delete(skinMeshArray, ch=True)
-        maya.cmds.sets(
-            skinMeshArray,
-            e=True,
-            forceElement='initialShadingGroup')
-        maya.cmds.editDisplayLayerMembers(
-            'skinMeshLayer',
-            skinMeshArray)
-        maya.cmds.setAttr('exportsLayer.visibility', 0)
-        maya.cmds.setAttr('skinMeshLayer.visibility', 1)
-        maya.cmds.setAttr('assetsLayer.visibility', 0)
-        maya.cmds.editDisplayLayerGlobals(cdl='skinMeshLayer')
+                name = maya.cmds.getAttr(
+                    skinMesh[0] + '.uvSet[0].uvSetName')
+                maya.cmds.polyUVSet(
+                    skinMesh,
+                    rename=True,
+                    uvSet=name, newUVSet='UV0')
+                maya.cmds.polyUVSet(
+                    skinMesh,
+                    currentUVSet=True, uvSet='UV0')
+                maya.cmds.polyAutoProjection(
+                    skinMesh,
+                    lm=0, pb=0, ibd=1, cm=0, l=3,
+                    sc=1, o=0, p=6, ps=0.2, ws=0)
+                maya.cmds.setAttr(skinMesh[0] + '.outlinerColor', 0.75, 0.25, 1)
+                maya.cmds.setAttr(skinMesh[0] + '.useOutlinerColor', True)
+                skinMeshArray.append(skinMesh[0])
+
+            maya.cmds.delete(skinMeshArray, ch=True)
+            maya.cmds.sets(
+                skinMeshArray,
+                e=True,
+                forceElement='initialShadingGroup')
+            maya.cmds.editDisplayLayerMembers(
+                'skinMeshLayer',
+                skinMeshArray)
+            maya.cmds.setAttr('exportsLayer.visibility', 0)
+            maya.cmds.setAttr('skinMeshLayer.visibility', 1)
+            maya.cmds.setAttr('assetsLayer.visibility', 0)
+            maya.cmds.editDisplayLayerGlobals(cdl='skinMeshLayer')
+        finally:
+            maya.cmds.refresh(suspend=False)
+            maya.cmds.undoInfo(closeChunk=True)
+
         # hacky hack to refresh the layer editor
         maya.cmds.delete(maya.cmds.createDisplayLayer(empty=True))
 
@@ -2436,16 +2402,28 @@ class ToolActions(object):
             maya.cmds.setAttr(obj+'.subMeshes', flag)
 
     def setSubdivisionFlag(self, objects, flag):
-        if flag > 0:
-            maya.cmds.setAttr('sxCrease1.creaseLevel', flag * 0.25)
-            maya.cmds.setAttr('sxCrease2.creaseLevel', flag * 0.5)
-            maya.cmds.setAttr('sxCrease3.creaseLevel', flag * 0.75)
-            maya.cmds.setAttr('sxCrease4.creaseLevel', 10)
-
-        for obj in objects:
-            maya.cmds.setAttr(obj+'.subdivisionLevel', flag)
-            objShape = maya.cmds.listRelatives(obj, shapes=True)[0]
-            maya.cmds.setAttr(objShape+'.smoothLevel', flag)
+        # collect the attribute edits into one undo step
+        maya.cmds.undoInfo(openChunk=True)
+        try:
+            if flag > 0:
+                creaseLevels = (flag * 0.25, flag * 0.5, flag * 0.75, 10)
+                for i, creaseLevel in enumerate(creaseLevels):
+                    maya.cmds.setAttr(
+                        'sxCrease' + str(i + 1) + '.creaseLevel', creaseLevel)
+
+            # with one shape per object a single query
+            # returns the shapes in object order
+            objShapes = maya.cmds.listRelatives(objects, shapes=True) or []
+            if len(objShapes) != len(objects):
+                objShapes = [
+                    maya.cmds.listRelatives(obj, shapes=True)[0]
+                    for obj in objects]
+
+            for obj, objShape in zip(objects, objShapes):
+                maya.cmds.setAttr(obj+'.subdivisionLevel', flag)
+                maya.cmds.setAttr(objShape+'.smoothLevel', flag)
+        finally:
+            maya.cmds.undoInfo(closeChunk=True)
 
     def setCreaseBevelFlag(self, objects, flag):
         for obj in objects:
@@ -6,6 +6,7 @@
 
 import maya.cmds
 import maya.mel as mel
+import functools
 import sxglobals
 
 
@@ -13,11 +14,30 @@ class UI(object):
     def __init__(self):
         self.history = False
         self.multiShapes = False
+        self.layerRefreshKey = None
         return None
 
     def __del__(self):
         print('SX Tools: Exiting UI')
 
+    def buildSuspended(self, *uiFunctions):
+        # suspend viewport redraws while the widgets are created
+        maya.cmds.refresh(suspend=True)
+        try:
+            for uiFunction in uiFunctions:
+                uiFunction()
+        finally:
+            maya.cmds.refresh(suspend=False)
+
+    def resizeDock(self):
+        # resize flags are edit-only, so skip hidden or collapsed docks
+        dockID = sxglobals.dockID
+        if (not maya.cmds.workspaceControl(dockID, query=True, visible=True) or
+           maya.cmds.workspaceControl(dockID, query=True, collapse=True)):
+            return
+        maya.cmds.workspaceControl(
+            dockID, edit=True, resizeHeight=5, resizeWidth=250)
+
     def calculateDivision(self):
         paneHeight = maya.cmds.workspaceControl(sxglobals.dockID, query=True, height=True)
         if sxglobals.settings.frames['paneDivision'] == 0:
@@ -33,6 +53,40 @@ class UI(object):
             division = 100
         sxglobals.settings.frames['paneDivision'] = division
 
+    # Button callbacks are bound methods, so Maya calls them
+    # directly instead of compiling a command string per click
+    def disableHistory(self, *args):
+        maya.cmds.delete(sxglobals.settings.objectArray, ch=True)
+        maya.cmds.constructionHistory(toggle=False)
+        sxglobals.core.updateSXTools()
+
+    def deleteExtraShapes(self, *args):
+        maya.cmds.delete(sxglobals.settings.multiShapeArray, shape=True)
+        sxglobals.core.updateSXTools()
+
+    def viewExported(self, *args):
+        sxglobals.export.viewExported()
+
+    def viewExportedMaterial(self, *args):
+        sxglobals.export.viewExportedMaterial()
+
+    def showSourceMeshes(self, *args):
+        maya.cmds.setAttr('exportsLayer.visibility', 0)
+        maya.cmds.setAttr('skinMeshLayer.visibility', 0)
+        maya.cmds.setAttr('assetsLayer.visibility', 1)
+        maya.cmds.editDisplayLayerGlobals(cdl='assetsLayer')
+        maya.cmds.delete(maya.cmds.createDisplayLayer(empty=True))
+        sxglobals.settings.tools['compositeEnabled'] = True
+        maya.cmds.select(clear=True)
+
+    def setExportPath(self, *args):
+        sxglobals.export.setExportPath()
+        sxglobals.core.updateSXTools()
+
+    def exportObjects(self, *args):
+        sxglobals.export.exportObjects(
+            sxglobals.settings.project['SXToolsExportPath'])
+
     def historyUI(self):
         maya.cmds.frameLayout(
             'historyWarningFrame',
@@ -46,10 +100,7 @@ class UI(object):
             'disableHistoryButton',
             parent='historyWarningFrame',
             label='Delete and Disable History',
-            command=(
-                'maya.cmds.delete(sxtools.sxglobals.settings.objectArray, ch=True)\n'
-                'maya.cmds.constructionHistory(toggle=False)\n'
-                'sxtools.sxglobals.core.updateSXTools()'))
+            command=self.disableHistory)
 
     def multiShapesUI(self):
         maya.cmds.frameLayout(
@@ -64,12 +115,11 @@ class UI(object):
             'disableShapesButton',
             parent='shapeWarningFrame',
             label='Delete Extra Shapes',
-            command=(
-                'maya.cmds.delete('
-                'sxtools.sxglobals.settings.multiShapeArray, shape=True)\n'
-                'sxtools.sxglobals.core.updateSXTools()'))
+            command=self.deleteExtraShapes)
 
     def setupProjectUI(self):
+        project = sxglobals.settings.project
+
         maya.cmds.frameLayout(
             'emptyFrame',
             label='No mesh objects selected',
@@ -92,10 +142,7 @@ class UI(object):
             expandCommand=(
                 "sxtools.sxglobals.settings.frames['prefsCollapse']=False"))
 
-        if 'dockPosition' in sxglobals.settings.project:
-            dockId = sxglobals.settings.project['DockPosition']
-        else:
-            dockId = 1
+        dockId = project.get('DockPosition', 1)
 
         maya.cmds.radioButtonGrp(
             'dockPrefsButtons',
@@ -105,11 +152,11 @@ class UI(object):
             select=dockId,
             numberOfRadioButtons=2,
             onCommand1=(
-                "sxtools.sxglobals.settings.project['dockPosition'] = 1\n"
+                "sxtools.sxglobals.settings.project['DockPosition'] = 1\n"
                 "maya.cmds.workspaceControl('SXToolsUI', edit=True,"
                 " dockToControl=('Outliner', 'right'))"),
             onCommand2=(
-                "sxtools.sxglobals.settings.project['dockPosition'] = 2\n"
+                "sxtools.sxglobals.settings.project['DockPosition'] = 2\n"
                 "maya.cmds.workspaceControl('SXToolsUI', edit=True,"
                 " dockToControl=('AttributeEditor', 'left'))"))
 
@@ -152,9 +199,29 @@ class UI(object):
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['setupCollapse']=True"),
             expandCommand=(
-                "sxtools.sxglobals.settings.frames['setupCollapse']=False"),
+                "sxtools.sxglobals.settings.frames['setupCollapse']=False\n"
+                "sxtools.sxglobals.ui.setupProjectBodyUI()\n"
+                "sxtools.sxglobals.ui.resizeDock()"),
             borderVisible=False)
 
+        # Setup fields are built on first expand of the frame
+        if not sxglobals.settings.frames['setupCollapse']:
+            self.setupProjectBodyUI()
+
+    def setupProjectBodyUI(self):
+        # The canvas is rebuilt on every refresh, so this only
+        # guards against building the fields twice per rebuild
+        if maya.cmds.layout('prefsColumn', exists=True):
+            return
+
+        project = sxglobals.settings.project
+        layerData = project.get('LayerData')
+        refLayerData = sxglobals.settings.refLayerData
+        refArray = sxglobals.settings.refArray
+        settingsFile = ''
+        if maya.cmds.optionVar(exists='SXToolsSettingsFile'):
+            settingsFile = str(maya.cmds.optionVar(query='SXToolsSettingsFile'))
+
         maya.cmds.columnLayout(
             'prefsColumn',
             parent='setupFrame',
@@ -169,12 +236,11 @@ class UI(object):
                 'sxtools.sxglobals.settings.setFile(0)\n'
                 'sxtools.sxglobals.core.updateSXTools()'))
 
-        if maya.cmds.optionVar(exists='SXToolsSettingsFile') and len(
-                str(maya.cmds.optionVar(query='SXToolsSettingsFile'))) > 0:
+        if len(settingsFile) > 0:
             maya.cmds.text(
                 label='Current settings location:')
             maya.cmds.text(
-                label=maya.cmds.optionVar(query='SXToolsSettingsFile'),
+                label=settingsFile,
                 ww=True)
         else:
             maya.cmds.text(
@@ -192,128 +258,24 @@ class UI(object):
             columnAttach=[(1, 'left', 0), (2, 'left', 0), (3, 'left', 0)],
             rowSpacing=(1, 0))
 
-        maya.cmds.text(label=' ')
-        maya.cmds.text(label='Count')
-        maya.cmds.text(label='Mask Export')
-
-        # Max layers 10. Going higher causes instability on GPU compositing.
-        maya.cmds.text(label='Color layers:')
-        maya.cmds.intField(
-            'layerCount',
-            value=10,
-            minValue=1,
-            maxValue=10,
-            step=1,
-            changeCommand=(
-                "sxtools.sxglobals.ui.refreshLayerDisplayNameList()\n"
-                "maya.cmds.setFocus('MayaWindow')"))
-        if 'LayerCount' in sxglobals.settings.project:
-            maya.cmds.intField(
-                'layerCount',
-                edit=True,
-                value=sxglobals.settings.project['LayerCount'])
-
-        #maya.cmds.textField('maskExport', text='U1')
-        maya.cmds.textField(
-            'maskExport',
-            text=sxglobals.settings.refLayerData['layer1'][2])
-
-        maya.cmds.text(label=' ')
-        maya.cmds.text(label=' ')
-        maya.cmds.text(label=' ')
-
-        maya.cmds.text(label='Channel')
-        maya.cmds.text(label='Enabled')
-        maya.cmds.text(label='Export UV')
-
-        maya.cmds.text('occlusionLabel', label='Occlusion:')
-        maya.cmds.checkBox('occlusion', label='', value=True)
-        maya.cmds.textField(
-            'occlusionExport',
-            text=sxglobals.settings.refLayerData['occlusion'][2])
-
-        maya.cmds.text('metallicLabel', label='Metallic:')
-        maya.cmds.checkBox('metallic', label='', value=True)
-        maya.cmds.textField(
-            'metallicExport',
-            text=sxglobals.settings.refLayerData['metallic'][2])
-
-        maya.cmds.text('smoothnessLabel', label='Smoothness:')
-        maya.cmds.checkBox('smoothness', label='', value=True)
-        maya.cmds.textField(
-            'smoothnessExport',
-            text=sxglobals.settings.refLayerData['smoothness'][2])
-
-        maya.cmds.text('transmissionLabel', label='Transmission:')
-        maya.cmds.checkBox('transmission', label='', value=True)
-        maya.cmds.textField(
-            'transmissionExport',
-            text=sxglobals.settings.refLayerData['transmission'][2])
-
-        maya.cmds.text('emissionLabel', label='Emission:')
-        maya.cmds.checkBox('emission', label='', value=True)
-        maya.cmds.textField(
-            'emissionExport',
-            text=sxglobals.settings.refLayerData['emission'][2])
-
-        maya.cmds.text('alphaOverlay1Label', label='Overlay1 (A):')
-        maya.cmds.textField('alphaOverlay1', text='layer8')
-        maya.cmds.textField('alphaOverlay1Export', text='U4')
-
-        maya.cmds.text('alphaOverlay2Label', label='Overlay2 (A):')
-        maya.cmds.textField('alphaOverlay2', text='layer9')
-        maya.cmds.textField('alphaOverlay2Export', text='V4')
-
-        maya.cmds.text('overlayLabel', label='Overlay (RGBA):')
-        maya.cmds.textField('overlay', text='layer10')
-        maya.cmds.textField('overlayExport', text='UV5,UV6')
-
-        if 'LayerData' in sxglobals.settings.project:
-            maya.cmds.checkBox(
-                'occlusion',
-                edit=True,
-                value=bool(sxglobals.settings.project['LayerData']['occlusion'][5]))
-            maya.cmds.checkBox(
-                'metallic',
-                edit=True,
-                value=bool(sxglobals.settings.project['LayerData']['metallic'][5]))
-            maya.cmds.checkBox(
-                'smoothness',
-                edit=True,
-                value=bool(sxglobals.settings.project['LayerData']['smoothness'][5]))
-            maya.cmds.checkBox(
-                'transmission',
-                edit=True,
-                value=bool(sxglobals.settings.project['LayerData']['transmission'][5]))
-            maya.cmds.checkBox(
-                'emission',
-                edit=True,
-                value=bool(sxglobals.settings.project['LayerData']['emission'][5]))
-            maya.cmds.textField(
-                'maskExport',
-                edit=True,
-                text=(sxglobals.settings.project['LayerData']['layer1'][2]))
-            maya.cmds.textField(
-                'occlusionExport',
-                edit=True,
-                text=(sxglobals.settings.project['LayerData']['occlusion'][2]))
-            maya.cmds.textField(
-                'metallicExport',
-                edit=True,
-                text=(sxglobals.settings.project['LayerData']['metallic'][2]))
-            maya.cmds.textField(
-                'smoothnessExport',
-                edit=True,
-                text=(sxglobals.settings.project['LayerData']['smoothness'][2]))
-            maya.cmds.textField(
-                'transmissionExport',
-                edit=True,
-                text=(sxglobals.settings.project['LayerData']['transmission'][2]))
-            maya.cmds.textField(
-                'emissionExport',
-                edit=True,
-                text=(sxglobals.settings.project['LayerData']['emission'][2]))
-
+        # Resolve the project values first, so each
+        # widget is created once with its final value
+        layerCount = project.get('LayerCount', 10)
+        channels = (
+            'occlusion', 'metallic', 'smoothness', 'transmission', 'emission')
+        channelData = layerData
+        if channelData is None:
+            channelData = refLayerData
+        maskExport = channelData['layer1'][2]
+
+        alpha1 = 'layer8'
+        alpha2 = 'layer9'
+        alpha1Export = 'U4'
+        alpha2Export = 'V4'
+        overlay = 'layer10'
+        overlayExport = 'UV5,UV6'
+
+        if layerData is not None:
             alpha1 = None
             alpha2 = None
             alpha1Export = None
@@ -321,7 +283,7 @@ class UI(object):
             overlay = None
             overlayExport = None
 
-            for key, value in sxglobals.settings.project['LayerData'].iteritems():
+            for key, value in layerData.iteritems():
                 if value[3] == 1:
                     alpha1 = key
                     alpha1Export = value[2]
@@ -331,30 +293,58 @@ class UI(object):
                 if value[4]:
                     overlay = key
                     overlayExport = ', '.join(value[2])
-            maya.cmds.textField(
-                'alphaOverlay1',
-                edit=True,
-                text=alpha1)
-            maya.cmds.textField(
-                'alphaOverlay2',
-                edit=True,
-                text=alpha2)
-            maya.cmds.textField(
-                'alphaOverlay1Export',
-                edit=True,
-                text=alpha1Export)
-            maya.cmds.textField(
-                'alphaOverlay2Export',
-                edit=True,
-                text=alpha2Export)
-            maya.cmds.textField(
-                'overlay',
-                edit=True,
-                text=overlay)
-            maya.cmds.textField(
-                'overlayExport',
-                edit=True,
-                text=overlayExport)
+
+        text = maya.cmds.text
+        textField = maya.cmds.textField
+
+        text(label=' ')
+        text(label='Count')
+        text(label='Mask Export')
+
+        # Max layers 10. Going higher causes instability on GPU compositing.
+        text(label='Color layers:')
+        maya.cmds.intField(
+            'layerCount',
+            value=layerCount,
+            minValue=1,
+            maxValue=10,
+            step=1,
+            changeCommand=(
+                "sxtools.sxglobals.ui.refreshLayerDisplayNameList()\n"
+                "maya.cmds.setFocus('MayaWindow')"))
+
+        textField(
+            'maskExport',
+            text=maskExport)
+
+        text(label=' ')
+        text(label=' ')
+        text(label=' ')
+
+        text(label='Channel')
+        text(label='Enabled')
+        text(label='Export UV')
+
+        for channel in channels:
+            text(
+                channel + 'Label',
+                label=channel.capitalize() + ':')
+            maya.cmds.checkBox(
+                channel,
+                label='',
+                value=(layerData is None) or bool(layerData[channel][5]))
+            textField(
+                channel + 'Export',
+                text=channelData[channel][2])
+
+        overlays = (
+            ('alphaOverlay1', 'Overlay1 (A):', alpha1, alpha1Export),
+            ('alphaOverlay2', 'Overlay2 (A):', alpha2, alpha2Export),
+            ('overlay', 'Overlay (RGBA):', overlay, overlayExport))
+        for field, label, value, export in overlays:
+            text(field + 'Label', label=label)
+            textField(field, text=value)
+            textField(field + 'Export', text=export)
 
         maya.cmds.rowColumnLayout(
             'numlayerFrames',
@@ -372,67 +362,52 @@ class UI(object):
             'numMasks',
             minValue=0,
             maxValue=10,
-            value=7,
+            value=project.get('MaskCount', 7),
             step=1,
             enterCommand=("maya.cmds.setFocus('MayaWindow')"))
-        if 'MaskCount' in sxglobals.settings.project:
-            maya.cmds.intField(
-                'numMasks',
-                edit=True,
-                value=sxglobals.settings.project['MaskCount'])
         maya.cmds.text(label='Alpha-to-mask limit:')
         maya.cmds.floatField(
             'exportTolerance',
-            value=1.0,
+            value=project.get('AlphaTolerance', 1.0),
             minValue=0,
             maxValue=1,
             precision=1,
             enterCommand=("maya.cmds.setFocus('MayaWindow')"))
-        if 'AlphaTolerance' in sxglobals.settings.project:
-            maya.cmds.floatField(
-                'exportTolerance',
-                edit=True,
-                value=sxglobals.settings.project['AlphaTolerance'])
         maya.cmds.text(label='Export preview grid spacing:')
         maya.cmds.intField(
             'exportOffset',
-            value=5,
+            value=project.get('ExportOffset', 5),
             minValue=0,
             step=1,
             enterCommand=("maya.cmds.setFocus('MayaWindow')"))
-        if 'ExportOffset' in sxglobals.settings.project:
-            maya.cmds.intField(
-                'exportOffset',
-                edit=True,
-                value=sxglobals.settings.project['ExportOffset'])
 
         maya.cmds.text(label='Use "_paletted" export suffix:')
         maya.cmds.checkBox(
             'suffixCheck',
             label='',
-            value=False,
+            value=project.get('ExportSuffix', False),
             changeCommand=(
                 "sxtools.sxglobals.settings.project['ExportSuffix'] = ("
                 "maya.cmds.checkBox('suffixCheck', query=True, value=True))"))
-        if 'ExportSuffix' in sxglobals.settings.project:
-            maya.cmds.checkBox(
-                'suffixCheck',
-                edit=True,
-                value=sxglobals.settings.project['ExportSuffix'])
 
         maya.cmds.text(label='')
         maya.cmds.text(label='')
 
+        # Fields start out in the state refreshLayerDisplayNameList
+        # would leave them, so no refresh pass is needed after creation
         for i in xrange(10):
-            layerName = sxglobals.settings.refLayerData[sxglobals.settings.refArray[i]][6]
-            labelID = 'display'+str(i+1)
-            labelText = sxglobals.settings.refArray[i] + ' display name:'
-            fieldLabel = sxglobals.settings.refArray[i] + 'Display'
-            if (('LayerData' in sxglobals.settings.project) and
-               (layerName in sxglobals.settings.project['LayerData'].keys())):
-                layerName = sxglobals.settings.project['LayerData'][layerName][6]
-            maya.cmds.text(labelID, label=labelText)
-            maya.cmds.textField(fieldLabel, text=layerName)
+            refName = refArray[i]
+            if ((layerData is not None) and
+               (refName in layerData)):
+                layerName = layerData[refName][6]
+            else:
+                layerName = refLayerData[refName][6]
+            text('display%d' % (i + 1), label=refName + ' display name:')
+            textField(
+                refName + 'Display',
+                text=layerName,
+                enable=(i < layerCount))
+        self.layerRefreshKey = (layerCount, id(layerData))
 
         maya.cmds.columnLayout(
             'reflayerFrame',
@@ -441,8 +416,7 @@ class UI(object):
             adjustableColumn=True)
         maya.cmds.text(label=' ', parent='reflayerFrame')
 
-        if maya.cmds.optionVar(exists='SXToolsSettingsFile') and len(
-                str(maya.cmds.optionVar(query='SXToolsSettingsFile'))) > 0:
+        if len(settingsFile) > 0:
             maya.cmds.text(
                 label='(Shift-click below to apply built-in defaults)',
                 parent='reflayerFrame')
@@ -458,28 +432,33 @@ class UI(object):
                     "sxtools.sxglobals.settings.frames['setupCollapse']=True\n"
                     "sxtools.sxglobals.core.updateSXTools()"))
 
-        self.refreshLayerDisplayNameList()
-
-        maya.cmds.workspaceControl(
-            sxglobals.dockID, edit=True, resizeHeight=5, resizeWidth=250)
-
     def refreshLayerDisplayNameList(self):
+        layerData = sxglobals.settings.project.get('LayerData')
+        layerCount = maya.cmds.intField('layerCount', query=True, value=True)
+        refreshKey = (layerCount, id(layerData))
+        if refreshKey == self.layerRefreshKey:
+            return
+        self.layerRefreshKey = refreshKey
+
+        refLayerData = sxglobals.settings.refLayerData
+        refArray = sxglobals.settings.refArray
+        textField = maya.cmds.textField
         for i in xrange(10):
-            layerName = sxglobals.settings.refArray[i]
+            layerName = refArray[i]
             fieldLabel = layerName + 'Display'
-            if i < maya.cmds.intField('layerCount', query=True, value=True):
-                if (('LayerData' in sxglobals.settings.project) and
-                   (layerName in sxglobals.settings.project['LayerData'].keys())):
-                    layerText = sxglobals.settings.project['LayerData'][layerName][6]
+            if i < layerCount:
+                if ((layerData is not None) and
+                   (layerName in layerData)):
+                    layerText = layerData[layerName][6]
                 else:
-                    layerText = sxglobals.settings.refLayerData[sxglobals.settings.refArray[i]][6]
-                maya.cmds.textField(
+                    layerText = refLayerData[layerName][6]
+                textField(
                     fieldLabel,
                     edit=True,
                     enable=True,
                     text=layerText)
             else:
-                maya.cmds.textField(
+                textField(
                     fieldLabel,
                     edit=True,
                     enable=False)
@@ -487,67 +466,42 @@ class UI(object):
     def exportObjectsUI(self):
         maya.cmds.frameLayout(
             'exportObjFrame',
-            label=str(len(sxglobals.settings.objectArray)) + ' export objects selected',
+            label='%d export objects selected' % len(sxglobals.settings.objectArray),
             parent='topCanvas',
             width=250,
             marginWidth=10,
             marginHeight=2)
         maya.cmds.button(
             label='Select and show all export meshes',
-            command='sxtools.sxglobals.export.viewExported()')
+            command=self.viewExported)
         maya.cmds.button(
             label='Hide exported, show source meshes',
-            command=(
-                "maya.cmds.setAttr('exportsLayer.visibility', 0)\n"
-                "maya.cmds.setAttr('skinMeshLayer.visibility', 0)\n"
-                "maya.cmds.setAttr('assetsLayer.visibility', 1)\n"
-                "maya.cmds.editDisplayLayerGlobals(cdl='assetsLayer')\n"
-                "maya.cmds.delete(maya.cmds.createDisplayLayer(empty=True))\n"
-                "sxtools.sxglobals.settings.tools['compositeEnabled']=True\n"
-                "maya.cmds.select(clear=True)"))
+            command=self.showSourceMeshes)
 
         maya.cmds.text(label='Preview export object data:')
-        maya.cmds.radioButtonGrp(
-            'exportShadingButtons1',
-            parent='exportObjFrame',
-            vertical=True,
-            columnWidth4=(80, 80, 80, 80),
-            columnAttach4=('left', 'left', 'left', 'left'),
-            labelArray4=['Composite', 'Albedo', 'Layer Masks', 'Occlusion'],
-            numberOfRadioButtons=4,
-            onCommand1=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand2=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand3=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand4=("sxtools.sxglobals.export.viewExportedMaterial()"))
-
-        maya.cmds.radioButtonGrp(
-            'exportShadingButtons2',
-            parent='exportObjFrame',
-            vertical=True,
-            shareCollection='exportShadingButtons1',
-            columnWidth4=(80, 80, 80, 80),
-            columnAttach4=('left', 'left', 'left', 'left'),
-            labelArray4=['Metallic', 'Smoothness', 'Transmission', 'Emission'],
-            numberOfRadioButtons=4,
-            onCommand1=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand2=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand3=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand4=("sxtools.sxglobals.export.viewExportedMaterial()"))
-
-        maya.cmds.radioButtonGrp(
-            'exportShadingButtons3',
-            parent='exportObjFrame',
-            vertical=True,
-            shareCollection='exportShadingButtons1',
-            columnWidth4=(80, 80, 80, 80),
-            columnAttach4=('left', 'left', 'left', 'left'),
-            labelArray4=['Alpha Overlay 1', 'Alpha Overlay 2', 'Overlay', 'Sub-Meshes'],
-            numberOfRadioButtons=4,
-            onCommand1=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand2=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand3=("sxtools.sxglobals.export.viewExportedMaterial()"),
-            onCommand4=("sxtools.sxglobals.export.viewExportedMaterial()"))
-
+        shadingGroups = (
+            ('Composite', 'Albedo', 'Layer Masks', 'Occlusion'),
+            ('Metallic', 'Smoothness', 'Transmission', 'Emission'),
+            ('Alpha Overlay 1', 'Alpha Overlay 2', 'Overlay', 'Sub-Meshes'))
+        for i, labels in enumerate(shadingGroups):
+            groupFlags = {}
+            if i > 0:
+                groupFlags['shareCollection'] = 'exportShadingButtons1'
+            maya.cmds.radioButtonGrp(
+                'exportShadingButtons' + str(i + 1),
+                parent='exportObjFrame',
+                vertical=True,
+                columnWidth4=(80, 80, 80, 80),
+                columnAttach4=('left', 'left', 'left', 'left'),
+                labelArray4=labels,
+                numberOfRadioButtons=4,
+                onCommand1=self.viewExportedMaterial,
+                onCommand2=self.viewExportedMaterial,
+                onCommand3=self.viewExportedMaterial,
+                onCommand4=self.viewExportedMaterial,
+                **groupFlags)
+
+        # preview sub-meshes if any export object has them
         for obj in sxglobals.settings.objectArray:
             if maya.cmds.getAttr(str(obj) + '.subMeshes'):
                 maya.cmds.radioButtonGrp(
@@ -555,46 +509,36 @@ class UI(object):
                     edit=True,
                     select=4)
                 break
-            else:
-                maya.cmds.radioButtonGrp(
-                    'exportShadingButtons1',
-                    edit=True,
-                    select=1)
+        else:
+            maya.cmds.radioButtonGrp(
+                'exportShadingButtons1',
+                edit=True,
+                select=1)
 
         sxglobals.export.viewExportedMaterial()
 
         maya.cmds.button(
             label='Choose Export Path',
             width=120,
-            command=(
-                "sxtools.sxglobals.export.setExportPath()\n"
-                "sxtools.sxglobals.core.updateSXTools()"))
+            command=self.setExportPath)
 
-        if (('SXToolsExportPath' in sxglobals.settings.project) and
-           (len(sxglobals.settings.project['SXToolsExportPath']) == 0)):
-            maya.cmds.text(label='No export folder selected!')
-        elif 'SXToolsExportPath' in sxglobals.settings.project:
-            exportPathText = (
-                'Export Path: ' + sxglobals.settings.project['SXToolsExportPath'])
-            maya.cmds.text(label=exportPathText, ww=True)
+        exportPath = sxglobals.settings.project.get('SXToolsExportPath')
+        if exportPath:
+            maya.cmds.text(label='Export Path: ' + exportPath, ww=True)
             maya.cmds.button(
                 label='Write FBX Files',
                 width=120,
-                command=(
-                    "sxtools.sxglobals.export.exportObjects("
-                    "sxtools.sxglobals.settings.project['SXToolsExportPath'])"))
+                command=self.exportObjects)
         else:
             maya.cmds.text(label='No export folder selected!')
 
         maya.cmds.setParent('exportObjFrame')
         maya.cmds.setParent('topCanvas')
-        maya.cmds.workspaceControl(
-            sxglobals.dockID, edit=True, resizeHeight=5, resizeWidth=250)
 
     def emptyObjectsUI(self):
         sxglobals.settings.patchArray = sxglobals.layers.verifyObjectLayers(
             sxglobals.settings.shapeArray)[1]
-        patchLabel = 'Objects with no layers: ' + str(len(sxglobals.settings.patchArray))
+        patchLabel = 'Objects with no layers: %d' % len(sxglobals.settings.patchArray)
         maya.cmds.frameLayout(
             'patchFrame',
             label=patchLabel,
@@ -619,13 +563,12 @@ class UI(object):
                     'sxtools.sxglobals.core.updateSXTools()'))
         maya.cmds.setParent('patchFrame')
         maya.cmds.setParent('topCanvas')
-        maya.cmds.workspaceControl(
-            sxglobals.dockID, edit=True, resizeHeight=5, resizeWidth=250)
 
     def mismatchingObjectsUI(self):
         sxglobals.settings.patchArray = sxglobals.layers.verifyObjectLayers(
             sxglobals.settings.shapeArray)[1]
-        patchLabel = 'Objects with nonstandard layers: ' + str(
+        patchLabel = (
+            'Objects with nonstandard layers: %d' %
             len(sxglobals.settings.patchArray))
         maya.cmds.frameLayout(
             'patchFrame',
@@ -659,8 +602,6 @@ class UI(object):
                     'sxtools.sxglobals.core.updateSXTools()'))
         maya.cmds.setParent('patchFrame')
         maya.cmds.setParent('topCanvas')
-        maya.cmds.workspaceControl(
-            sxglobals.dockID, edit=True, resizeHeight=5, resizeWidth=250)
 
     def skinMeshUI(self):
         maya.cmds.frameLayout(
@@ -680,8 +621,60 @@ class UI(object):
                 ww=True)
         maya.cmds.setParent('patchFrame')
         maya.cmds.setParent('topCanvas')
-        maya.cmds.workspaceControl(
-            sxglobals.dockID, edit=True, resizeHeight=5, resizeWidth=250)
+
+    # Layer list popup menu callbacks
+    def copyLayerSource(self, *args):
+        tools = sxglobals.settings.tools
+        tools['sourceLayer'] = tools['selectedLayer']
+        maya.cmds.menuItem(
+            'sourceNameMenuItem',
+            edit=True,
+            label='Source: ' + tools['selectedDisplayLayer'])
+
+    def pasteLayer(self, *args):
+        tools = sxglobals.settings.tools
+        tools['targetLayer'] = tools['selectedLayer']
+        sxglobals.tools.copyLayer(sxglobals.settings.shapeArray)
+
+    def swapLayer(self, *args):
+        tools = sxglobals.settings.tools
+        tools['targetLayer'] = tools['selectedLayer']
+        sxglobals.tools.copyLayer(sxglobals.settings.shapeArray, 2)
+
+    def mergeLayerUp(self, *args):
+        sxglobals.layers.mergeLayerDirection(
+            sxglobals.settings.shapeArray, True)
+
+    def mergeLayerDown(self, *args):
+        sxglobals.layers.mergeLayerDirection(
+            sxglobals.settings.shapeArray, False)
+
+    # Layer view callbacks, these fire on every click and slider drag
+    def highlightLayer(self, *args):
+        sxglobals.layers.highlightLayer()
+
+    def clearLayer(self, *args):
+        sxglobals.tools.clearSelector()
+        sxglobals.layers.refreshLayerList()
+        sxglobals.layers.compositeLayers()
+
+    def toggleLayer(self, *args):
+        sxglobals.layers.toggleAllLayers(
+            sxglobals.settings.tools['selectedLayer'])
+
+    def setLayerBlendMode(self, *args):
+        sxglobals.tools.setLayerBlendMode()
+
+    def pickLayerColor(self, *args):
+        sxglobals.settings.currentColor = maya.cmds.palettePort(
+            'layerPalette', query=True, rgb=True)
+        sxglobals.tools.setPaintColor(sxglobals.settings.currentColor)
+
+    def setLayerOpacity(self, *args):
+        # refreshLayerList also re-reads the layer palette and opacity
+        sxglobals.tools.setLayerOpacity()
+        sxglobals.layers.refreshLayerList()
+        sxglobals.layers.compositeLayers()
 
     def layerViewUI(self):
         maya.cmds.frameLayout(
@@ -772,14 +765,9 @@ class UI(object):
                 'H - hidden layer\n'
                 'M - mask layer\n'
                 'A - adjustment layer'),
-            selectCommand='sxtools.sxglobals.layers.highlightLayer()',
-            deleteKeyCommand=(
-                'sxtools.sxglobals.tools.clearSelector()\n'
-                'sxtools.sxglobals.layers.refreshLayerList()\n'
-                'sxtools.sxglobals.layers.compositeLayers()'),
-            doubleClickCommand=(
-                "sxtools.sxglobals.layers.toggleAllLayers("
-                "sxtools.sxglobals.settings.tools['selectedLayer'])"))
+            selectCommand=self.highlightLayer,
+            deleteKeyCommand=self.clearLayer,
+            doubleClickCommand=self.toggleLayer)
 
         maya.cmds.columnLayout(
             'layerSetButtonsRight',
@@ -833,7 +821,12 @@ class UI(object):
             print('SX Tools: Objects with mismatching Layer Sets selected!')
 
 
-        if sxglobals.layers.getLayerSets(sxglobals.settings.objectArray[0]) > 0:
+        numLayerSets = sxglobals.layers.getLayerSets(
+            sxglobals.settings.objectArray[0])
+        activeLayerSet = maya.cmds.getAttr(
+            str(sxglobals.settings.shapeArray[0]) + '.activeLayerSet')
+
+        if numLayerSets > 0:
             maya.cmds.button(
                 'deleteLayerSetButton',
                 edit=True,
@@ -847,24 +840,26 @@ class UI(object):
                 edit=True,
                 enable=True)
 
-        if sxglobals.layers.getLayerSets(sxglobals.settings.objectArray[0]) == 9:
+        if numLayerSets == 9:
             maya.cmds.button(
                 'addNewLayerSetButton',
                 edit=True,
                 enable=False)
 
-        if maya.cmds.getAttr(str(sxglobals.settings.shapeArray[0]) + '.activeLayerSet') == sxglobals.layers.getLayerSets(sxglobals.settings.objectArray[0]):
+        if activeLayerSet == numLayerSets:
             maya.cmds.button(
                 'nextLayerSetButton',
                 edit=True,
                 enable=False)
 
-        if maya.cmds.getAttr(str(sxglobals.settings.shapeArray[0]) + '.activeLayerSet') == 0:
+        if activeLayerSet == 0:
             maya.cmds.button(
                 'previousLayerSetButton',
                 edit=True,
                 enable=False)
 
+        sourceLabel = (
+            'Source Layer: ' + str(sxglobals.settings.tools['sourceLayer']))
         maya.cmds.popupMenu(
             'layerPopUp',
             parent='layerList')
@@ -872,30 +867,17 @@ class UI(object):
             'copyLayerMenuItem',
             parent='layerPopUp',
             label='Copy Layer',
-            command=(
-                'sxtools.sxglobals.settings.tools["sourceLayer"] = '
-                'sxtools.sxglobals.settings.tools["selectedLayer"]\n'
-                'maya.cmds.menuItem("sourceNameMenuItem", edit=True,'
-                'label="Source: " + '
-                'sxtools.sxglobals.settings.tools["selectedDisplayLayer"])'))
+            command=self.copyLayerSource)
         maya.cmds.menuItem(
             'pasteLayerMenuItem',
             parent='layerPopUp',
             label='Paste Layer',
-            command=(
-                'sxtools.sxglobals.settings.tools["targetLayer"] = '
-                'sxtools.sxglobals.settings.tools["selectedLayer"]\n'
-                'sxtools.sxglobals.tools.copyLayer('
-                'sxtools.sxglobals.settings.shapeArray)'))
+            command=self.pasteLayer)
         maya.cmds.menuItem(
             'swapLayerMenuItem',
             parent='layerPopUp',
             label='Swap Layer',
-            command=(
-                'sxtools.sxglobals.settings.tools["targetLayer"] = '
-                'sxtools.sxglobals.settings.tools["selectedLayer"]\n'
-                'sxtools.sxglobals.tools.copyLayer('
-                'sxtools.sxglobals.settings.shapeArray, 2)'))
+            command=self.swapLayer)
         maya.cmds.menuItem(
             parent='layerPopUp',
             divider=True)
@@ -903,23 +885,19 @@ class UI(object):
             'mergeUpMenuItem',
             parent='layerPopUp',
             label='Merge Layer Up',
-            command=(
-                "sxtools.sxglobals.layers.mergeLayerDirection("
-                "sxtools.sxglobals.settings.shapeArray, True)"))
+            command=self.mergeLayerUp)
         maya.cmds.menuItem(
             'mergeDownMenuItem',
             parent='layerPopUp',
             label='Merge Layer Down',
-            command=(
-                "sxtools.sxglobals.layers.mergeLayerDirection("
-                "sxtools.sxglobals.settings.shapeArray, False)"))
+            command=self.mergeLayerDown)
         maya.cmds.menuItem(
             parent='layerPopUp',
             divider=True)
         maya.cmds.menuItem(
             'sourceNameMenuItem',
             parent='layerPopUp',
-            label='Source Layer: ' + str(sxglobals.settings.tools["sourceLayer"]),
+            label=sourceLabel,
             enable=False)
 
         maya.cmds.rowColumnLayout(
@@ -945,10 +923,7 @@ class UI(object):
                     'all layers on selected components'),
                 width=100,
                 height=20,
-                command=(
-                    "sxtools.sxglobals.tools.clearSelector()\n"
-                    "sxtools.sxglobals.layers.refreshLayerList()\n"
-                    "sxtools.sxglobals.layers.compositeLayers()"))
+                command=self.clearLayer)
         else:
             maya.cmds.button(
                 'clearButton',
@@ -958,10 +933,7 @@ class UI(object):
                     'all layers on selected objects'),
                 width=100,
                 height=20,
-                command=(
-                    "sxtools.sxglobals.tools.clearSelector()\n"
-                    "sxtools.sxglobals.layers.refreshLayerList()\n"
-                    "sxtools.sxglobals.layers.compositeLayers()"))
+                command=self.clearLayer)
 
         maya.cmds.rowColumnLayout(
             'layerRowColumns',
@@ -977,7 +949,7 @@ class UI(object):
         maya.cmds.optionMenu(
             'layerBlendModes',
             parent='layerRowColumns',
-            changeCommand='sxtools.sxglobals.tools.setLayerBlendMode()')
+            changeCommand=self.setLayerBlendMode)
         maya.cmds.menuItem(
             'alphaBlend',
             label='Alpha',
@@ -1001,11 +973,7 @@ class UI(object):
             actualTotal=8,
             editable=True,
             colorEditable=False,
-            changeCommand=(
-                'sxtools.sxglobals.settings.currentColor = maya.cmds.palettePort('
-                '\"layerPalette\", query=True, rgb=True)\n'
-                'sxtools.sxglobals.tools.setPaintColor('
-                'sxtools.sxglobals.settings.currentColor)'))
+            changeCommand=self.pickLayerColor)
 
         maya.cmds.text(
             'layerOpacityLabel',
@@ -1014,12 +982,39 @@ class UI(object):
             'layerOpacitySlider',
             min=0.0,
             max=1.0,
-            changeCommand=(
-                "sxtools.sxglobals.tools.setLayerOpacity()\n"
-                "sxtools.sxglobals.layers.refreshLayerList()\n"
-                "sxtools.sxglobals.layers.compositeLayers()"))
+            changeCommand=self.setLayerOpacity)
+
+    # Apply color tool callbacks
+    def pickRecentColor(self, *args):
+        sxglobals.tools.setApplyColor()
+        sxglobals.tools.setPaintColor(sxglobals.settings.currentColor)
+
+    def setApplyColor(self, *args):
+        sxglobals.settings.currentColor = maya.cmds.colorSliderGrp(
+            'sxApplyColor', query=True, rgbValue=True)
+
+    def setNoiseValue(self, *args):
+        sxglobals.settings.tools['noiseValue'] = maya.cmds.floatSlider(
+            'noiseSlider', query=True, value=True)
+
+    def setNoiseMonochrome(self, *args):
+        sxglobals.settings.tools['noiseMonochrome'] = maya.cmds.checkBox(
+            'mono', query=True, value=True)
+
+    def setOverwriteAlpha(self, *args):
+        sxglobals.settings.tools['overwriteAlpha'] = maya.cmds.checkBox(
+            'overwriteAlpha', query=True, value=True)
+
+    def applyColor(self, *args):
+        self.setApplyColor()
+        sxglobals.tools.colorFill(
+            maya.cmds.checkBox('overwriteAlpha', query=True, value=True),
+            False)
+        sxglobals.tools.updateRecentPalette()
 
     def applyColorToolUI(self):
+        frames = sxglobals.settings.frames
+        tools = sxglobals.settings.tools
         maya.cmds.frameLayout(
             "applyColorFrame",
             parent="canvas",
@@ -1028,7 +1023,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=2,
             collapsable=True,
-            collapse=sxglobals.settings.frames['applyColorCollapse'],
+            collapse=frames['applyColorCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['applyColorCollapse']=True"),
             expandCommand=(
@@ -1059,11 +1054,8 @@ class UI(object):
             actualTotal=8,
             editable=True,
             colorEditable=False,
-            scc=sxglobals.settings.tools['recentPaletteIndex'],
-            changeCommand=(
-                'sxtools.sxglobals.tools.setApplyColor()\n'
-                'sxtools.sxglobals.tools.setPaintColor('
-                'sxtools.sxglobals.settings.currentColor)'))
+            scc=tools['recentPaletteIndex'],
+            changeCommand=self.pickRecentColor)
         maya.cmds.text(
             'applyColorLabel',
             parent='applyColorRowColumns',
@@ -1076,10 +1068,7 @@ class UI(object):
             columnWidth3=(0, 20, 120),
             adjustableColumn3=3,
             columnAlign3=('right', 'left', 'both'),
-            changeCommand=(
-                "sxtools.sxglobals.settings.currentColor = ("
-                "maya.cmds.colorSliderGrp("
-                "'sxApplyColor', query=True, rgbValue=True))"))
+            changeCommand=self.setApplyColor)
         maya.cmds.text(
             'noiseValueLabel',
             parent='applyColorRowColumns',
@@ -1091,11 +1080,8 @@ class UI(object):
             min=0.0,
             max=1.0,
             width=100,
-            value=sxglobals.settings.tools['noiseValue'],
-            changeCommand=(
-                "sxtools.sxglobals.settings.tools['noiseValue'] = ("
-                "maya.cmds.floatSlider("
-                "'noiseSlider', query=True, value=True))"))
+            value=tools['noiseValue'],
+            changeCommand=self.setNoiseValue)
         maya.cmds.text(
             'monoLabel',
             parent='applyColorRowColumns',
@@ -1104,10 +1090,8 @@ class UI(object):
             'mono',
             parent='applyColorRowColumns',
             label='',
-            value=sxglobals.settings.tools['noiseMonochrome'],
-            changeCommand=(
-                "sxtools.sxglobals.settings.tools['noiseMonochrome'] = ("
-                "maya.cmds.checkBox('mono', query=True, value=True))"))
+            value=tools['noiseMonochrome'],
+            changeCommand=self.setNoiseMonochrome)
         maya.cmds.text(
             'overwriteAlphaLabel',
             parent='applyColorRowColumns',
@@ -1121,24 +1105,14 @@ class UI(object):
                 'When applying color to an entire object, '
                 'disabling Overwrite Alpha will preserve '
                 'existing alpha values.'),
-            value=sxglobals.settings.tools['overwriteAlpha'],
-            changeCommand=(
-                'sxtools.sxglobals.settings.tools["overwriteAlpha"] = ('
-                'maya.cmds.checkBox('
-                '"overwriteAlpha", query=True, value=True))'))
+            value=tools['overwriteAlpha'],
+            changeCommand=self.setOverwriteAlpha)
         maya.cmds.button(
             label='Apply Color',
             parent='applyColorFrame',
             height=30,
             width=100,
-            command=(
-                'sxtools.sxglobals.settings.currentColor = ('
-                'maya.cmds.colorSliderGrp('
-                '"sxApplyColor", query=True, rgbValue=True))\n'
-                'sxtools.sxglobals.tools.colorFill('
-                'maya.cmds.checkBox('
-                '"overwriteAlpha", query=True, value=True), False)\n'
-                'sxtools.sxglobals.tools.updateRecentPalette()'))
+            command=self.applyColor)
         sxglobals.tools.getPalette(
             'recentPalette',
             sxglobals.settings.paletteDict,
@@ -1156,11 +1130,10 @@ class UI(object):
             edit=True,
             select=sxglobals.settings.tools['gradientDirection'])
 
-        presetNames = maya.cmds.nodePreset(list='SXRamp')
-        presetNameArray = []
-        for preset in presetNames:
-            if '_Alpha' not in preset:
-                presetNameArray.append(preset)
+        # nodePreset returns None when there are no saved presets
+        presetNames = maya.cmds.nodePreset(list='SXRamp') or []
+        presetNameArray = [
+            preset for preset in presetNames if '_Alpha' not in preset]
 
         if len(presetNameArray) > 0:
             for presetName in presetNameArray:
@@ -1299,6 +1272,8 @@ class UI(object):
         maya.cmds.setParent('canvas')
 
     def bakeOcclusionToolUI(self):
+        frames = sxglobals.settings.frames
+        tools = sxglobals.settings.tools
         maya.cmds.frameLayout(
             'occlusionFrame',
             parent='canvas',
@@ -1307,7 +1282,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=2,
             collapsable=True,
-            collapse=sxglobals.settings.frames['occlusionCollapse'],
+            collapse=frames['occlusionCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['occlusionCollapse']=True"),
             expandCommand=(
@@ -1331,7 +1306,7 @@ class UI(object):
         maya.cmds.text('rayCountLabel', label='Ray Count:')
         maya.cmds.intField(
             'rayCount',
-            value=sxglobals.settings.tools['rayCount'],
+            value=tools['rayCount'],
             ann=(
                 'The number of rays to fire from each vertex on the selection. '
                 'Lower ray counts are faster but more noisy.'),
@@ -1344,7 +1319,7 @@ class UI(object):
         maya.cmds.text('maxDistanceLabel', label='Ray Max Distance:')
         maya.cmds.floatField(
             'maxDistance',
-            value=sxglobals.settings.tools['maxDistance'],
+            value=tools['maxDistance'],
             ann='The distance beyond which no collisions are checked.',
             precision=1,
             minValue=0.0,
@@ -1356,7 +1331,7 @@ class UI(object):
         maya.cmds.text('comboOffsetLabel', label='Mesh Offset:')
         maya.cmds.floatField(
             'comboOffset',
-            value=sxglobals.settings.tools['comboOffset'],
+            value=tools['comboOffset'],
             ann='Shrinks the mesh to avoid proximity artifacts.',
             precision=3,
             minValue=0.0,
@@ -1368,7 +1343,7 @@ class UI(object):
         maya.cmds.text('biasLabel', label='Ray Source Offset:')
         maya.cmds.floatField(
             'bias',
-            value=sxglobals.settings.tools['bias'],
+            value=tools['bias'],
             ann=(
                 'Offsets the ray starting point from the mesh surface '
                 'to avoid self-collision.'),
@@ -1404,13 +1379,13 @@ class UI(object):
         maya.cmds.checkBox(
             'ground',
             label='',
-            value=sxglobals.settings.tools['bakeGroundPlane'],
+            value=tools['bakeGroundPlane'],
             changeCommand=(
                 "sxtools.sxglobals.settings.tools['bakeGroundPlane'] = ("
                 "maya.cmds.checkBox('ground', query=True, value=True))"))
         maya.cmds.floatField(
             'groundScale',
-            value=sxglobals.settings.tools['bakeGroundScale'],
+            value=tools['bakeGroundScale'],
             precision=1,
             minValue=0.0,
             changeCommand=(
@@ -1418,7 +1393,7 @@ class UI(object):
                 "maya.cmds.floatField('groundScale', query=True, value=True))"))
         maya.cmds.floatField(
             'groundOffset',
-            value=sxglobals.settings.tools['bakeGroundOffset'],
+            value=tools['bakeGroundOffset'],
             precision=1,
             minValue=0.0,
             changeCommand=(
@@ -1440,7 +1415,7 @@ class UI(object):
             min=0.0,
             max=1.0,
             width=100,
-            value=sxglobals.settings.tools['blendSlider'],
+            value=tools['blendSlider'],
             changeCommand=(
                 "sxtools.sxglobals.settings.tools['blendSlider'] = ("
                 "maya.cmds.floatSlider("
@@ -1456,8 +1431,7 @@ class UI(object):
                 'sxtools.sxglobals.tools.bakeBlendOcclusion()\n'
                 'sxtools.sxglobals.settings.saveFile(0)'))
 
-        plugList = maya.cmds.pluginInfo(query=True, listPlugins=True)
-        if 'Mayatomr' in plugList:
+        if maya.cmds.pluginInfo('Mayatomr', query=True, loaded=True):
             maya.cmds.button(
                 label='Bake Occlusion (Mental Ray)',
                 parent='occlusionFrame',
@@ -1468,16 +1442,12 @@ class UI(object):
         maya.cmds.setParent('canvas')
 
     def refreshCategoryMenu(self):
-        categoryNameArray = []
-        if len(sxglobals.settings.masterPaletteArray) > 0:
-            for category in sxglobals.settings.masterPaletteArray:
-                categoryNameArray.append(category.keys()[0])
-        if categoryNameArray is not None:
-            for categoryName in categoryNameArray:
-                maya.cmds.menuItem(
-                    categoryName+'Option',
-                    label=categoryName,
-                    parent='masterCategories')
+        for category in sxglobals.settings.masterPaletteArray:
+            categoryName = category.keys()[0]
+            maya.cmds.menuItem(
+                categoryName+'Option',
+                label=categoryName,
+                parent='masterCategories')
         if sxglobals.settings.tools['categoryPreset'] is not None:
             maya.cmds.optionMenu(
                 'masterCategories',
@@ -1485,23 +1455,31 @@ class UI(object):
                 select=sxglobals.settings.tools['categoryPreset'])
 
     def refreshMaterialCategoryMenu(self):
-        categoryNameArray = []
-        if len(sxglobals.settings.materialArray) > 0:
-            for category in sxglobals.settings.materialArray:
-                categoryNameArray.append(category.keys()[0])
-        if categoryNameArray is not None:
-            for categoryName in categoryNameArray:
-                maya.cmds.menuItem(
-                    categoryName+'Option',
-                    label=categoryName,
-                    parent='materialCategories')
+        for category in sxglobals.settings.materialArray:
+            categoryName = category.keys()[0]
+            maya.cmds.menuItem(
+                categoryName+'Option',
+                label=categoryName,
+                parent='materialCategories')
         if sxglobals.settings.tools['materialCategoryPreset'] is not None:
             maya.cmds.optionMenu(
                 'materialCategories',
                 edit=True,
                 select=sxglobals.settings.tools['materialCategoryPreset'])
 
+    # Palette row callbacks, the category and palette
+    # names are bound with functools.partial at build time
+    def pickMasterPalette(self, category, name, *args):
+        sxglobals.settings.currentColor = maya.cmds.palettePort(
+            category + name + 'Palette', query=True, rgb=True)
+        sxglobals.tools.setMasterPalette(category, name)
+        sxglobals.tools.setPaintColor(sxglobals.settings.currentColor)
+
+    def applyMasterPalette(self, category, name, *args):
+        sxglobals.tools.paletteButtonManager(category, name)
+
     def masterPaletteToolUI(self):
+        frames = sxglobals.settings.frames
         if ((maya.cmds.optionVar(exists='SXToolsPalettesFile')) and
            (len(str(maya.cmds.optionVar(query='SXToolsPalettesFile'))) > 0)):
             sxglobals.settings.loadFile(1)
@@ -1513,7 +1491,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=5,
             collapsable=True,
-            collapse=sxglobals.settings.frames['masterPaletteCollapse'],
+            collapse=frames['masterPaletteCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['masterPaletteCollapse']=True"),
             expandCommand=(
@@ -1526,43 +1504,44 @@ class UI(object):
             marginWidth=2,
             marginHeight=0,
             collapsable=True,
-            collapse=sxglobals.settings.frames['paletteCategoryCollapse'],
+            collapse=frames['paletteCategoryCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['paletteCategoryCollapse']=True"),
             expandCommand=(
                 "sxtools.sxglobals.settings.frames['paletteCategoryCollapse']=False"))
         if len(sxglobals.settings.masterPaletteArray) > 0:
             for categoryDict in sxglobals.settings.masterPaletteArray:
-                if categoryDict.keys()[0]+'Collapse' not in sxglobals.settings.frames:
-                    sxglobals.settings.frames[categoryDict.keys()[0]+'Collapse'] = True
+                category = categoryDict.keys()[0]
+                palettes = categoryDict[category]
+                collapseKey = category + 'Collapse'
+                collapsed = frames.setdefault(collapseKey, True)
                 maya.cmds.frameLayout(
-                    categoryDict.keys()[0],
+                    category,
                     parent='paletteCategoryFrame',
-                    label=categoryDict.keys()[0],
+                    label=category,
                     marginWidth=0,
                     marginHeight=0,
                     enableBackground=True,
                     backgroundColor=[0.32, 0.32, 0.32],
                     collapsable=True,
-                    collapse=(
-                        sxglobals.settings.frames[categoryDict.keys()[0]+'Collapse']),
+                    collapse=collapsed,
                     collapseCommand=(
                         'sxtools.sxglobals.settings.frames["' +
-                        categoryDict.keys()[0]+'"+"Collapse"]=True'),
+                        collapseKey + '"]=True'),
                     expandCommand=(
                         'sxtools.sxglobals.settings.frames["' +
-                        categoryDict.keys()[0]+'"+"Collapse"]=False'))
-                if len(categoryDict[categoryDict.keys()[0]]) > 0:
-                    for i, (name) in enumerate(
-                       categoryDict[categoryDict.keys()[0]].keys()):
+                        collapseKey + '"]=False'))
+                if len(palettes) > 0:
+                    for i, name in enumerate(palettes):
+                        rowName = category + name
                         stripeColor = []
                         if i % 2 == 0:
                             stripeColor = [0.22, 0.22, 0.22]
                         else:
                             stripeColor = [0.24, 0.24, 0.24]
                         maya.cmds.rowColumnLayout(
-                            categoryDict.keys()[0]+name,
-                            parent=categoryDict.keys()[0],
+                            rowName,
+                            parent=category,
                             numberOfColumns=3,
                             enableBackground=True,
                             backgroundColor=stripeColor,
@@ -1577,36 +1556,26 @@ class UI(object):
                             align='right',
                             font='smallPlainLabelFont')
                         maya.cmds.palettePort(
-                            categoryDict.keys()[0]+name+'Palette',
+                            rowName+'Palette',
                             dimensions=(5, 1),
                             width=80,
                             height=20,
                             actualTotal=5,
                             editable=True,
                             colorEditable=False,
-                            changeCommand=(
-                                'sxtools.sxglobals.settings.currentColor = '
-                                'maya.cmds.palettePort(' +
-                                '\"'+categoryDict.keys()[0]+name +
-                                'Palette'+'\", query=True, rgb=True)\n'
-                                'sxtools.sxglobals.tools.setMasterPalette(' +
-                                '\"'+categoryDict.keys()[0] +
-                                '\", \"'+name+'\")\n'
-                                'sxtools.sxglobals.tools.setPaintColor('
-                                'sxtools.sxglobals.settings.currentColor)'))
+                            changeCommand=functools.partial(
+                                self.pickMasterPalette, category, name))
                         sxglobals.tools.getPalette(
-                            categoryDict.keys()[0]+name+'Palette',
-                            categoryDict.keys()[0],
+                            rowName+'Palette',
+                            category,
                             name)
                         maya.cmds.button(
-                            categoryDict.keys()[0]+name+'Button',
+                            rowName+'Button',
                             label='Apply',
                             height=20,
                             ann='Shift-click to delete palette',
-                            command=(
-                                'sxtools.sxglobals.tools.paletteButtonManager(' +
-                                '\"'+categoryDict.keys()[0] +
-                                '\", \"'+name+'\")'))
+                            command=functools.partial(
+                                self.applyMasterPalette, category, name))
 
         maya.cmds.frameLayout(
             'createPaletteFrame',
@@ -1615,7 +1584,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=5,
             collapsable=True,
-            collapse=sxglobals.settings.frames['newPaletteCollapse'],
+            collapse=frames['newPaletteCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['newPaletteCollapse']=True"),
             expandCommand=(
@@ -1712,7 +1681,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=5,
             collapsable=True,
-            collapse=sxglobals.settings.frames['paletteSettingsCollapse'],
+            collapse=frames['paletteSettingsCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['paletteSettingsCollapse']=True"),
             expandCommand=(
@@ -1835,7 +1804,17 @@ class UI(object):
             placeholderText='layer5')
         maya.cmds.setParent('canvas')
 
+    def pickMaterialPalette(self, category, name, *args):
+        sxglobals.settings.currentColor = maya.cmds.palettePort(
+            category + name + 'Material', query=True, rgb=True)
+        sxglobals.tools.setMaterialPalette(category, name)
+        sxglobals.tools.setPaintColor(sxglobals.settings.currentColor)
+
+    def applyMaterialPalette(self, category, name, *args):
+        sxglobals.tools.materialButtonManager(category, name)
+
     def materialToolUI(self):
+        frames = sxglobals.settings.frames
         if ((maya.cmds.optionVar(exists='SXToolsMaterialsFile')) and
            (len(str(maya.cmds.optionVar(query='SXToolsMaterialsFile'))) > 0)):
             sxglobals.settings.loadFile(2)
@@ -1847,7 +1826,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=5,
             collapsable=True,
-            collapse=sxglobals.settings.frames['materialsCollapse'],
+            collapse=frames['materialsCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['materialsCollapse']=True"),
             expandCommand=(
@@ -1860,43 +1839,44 @@ class UI(object):
             marginWidth=2,
             marginHeight=0,
             collapsable=True,
-            collapse=sxglobals.settings.frames['materialCategoryCollapse'],
+            collapse=frames['materialCategoryCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['materialCategoryCollapse']=True"),
             expandCommand=(
                 "sxtools.sxglobals.settings.frames['materialCategoryCollapse']=False"))
         if len(sxglobals.settings.materialArray) > 0:
             for categoryDict in sxglobals.settings.materialArray:
-                if categoryDict.keys()[0]+'Collapse' not in sxglobals.settings.frames:
-                    sxglobals.settings.frames[categoryDict.keys()[0]+'Collapse'] = True
+                category = categoryDict.keys()[0]
+                materials = categoryDict[category]
+                collapseKey = category + 'Collapse'
+                collapsed = frames.setdefault(collapseKey, True)
                 maya.cmds.frameLayout(
-                    categoryDict.keys()[0],
+                    category,
                     parent='materialCategoryFrame',
-                    label=categoryDict.keys()[0],
+                    label=category,
                     marginWidth=0,
                     marginHeight=0,
                     enableBackground=True,
                     backgroundColor=[0.32, 0.32, 0.32],
                     collapsable=True,
-                    collapse=(
-                        sxglobals.settings.frames[categoryDict.keys()[0]+'Collapse']),
+                    collapse=collapsed,
                     collapseCommand=(
                         'sxtools.sxglobals.settings.frames["' +
-                        categoryDict.keys()[0]+'"+"Collapse"]=True'),
+                        collapseKey + '"]=True'),
                     expandCommand=(
                         'sxtools.sxglobals.settings.frames["' +
-                        categoryDict.keys()[0]+'"+"Collapse"]=False'))
-                if len(categoryDict[categoryDict.keys()[0]]) > 0:
-                    for i, (name) in enumerate(
-                       categoryDict[categoryDict.keys()[0]].keys()):
+                        collapseKey + '"]=False'))
+                if len(materials) > 0:
+                    for i, name in enumerate(materials):
+                        rowName = category + name
                         stripeColor = []
                         if i % 2 == 0:
                             stripeColor = [0.22, 0.22, 0.22]
                         else:
                             stripeColor = [0.24, 0.24, 0.24]
                         maya.cmds.rowColumnLayout(
-                            categoryDict.keys()[0]+name,
-                            parent=categoryDict.keys()[0],
+                            rowName,
+                            parent=category,
                             numberOfColumns=3,
                             enableBackground=True,
                             backgroundColor=stripeColor,
@@ -1911,36 +1891,26 @@ class UI(object):
                             align='right',
                             font='smallPlainLabelFont')
                         maya.cmds.palettePort(
-                            categoryDict.keys()[0]+name+'Material',
+                            rowName+'Material',
                             dimensions=(3, 1),
                             width=80,
                             height=20,
                             actualTotal=3,
                             editable=True,
                             colorEditable=False,
-                            changeCommand=(
-                                'sxtools.sxglobals.settings.currentColor = '
-                                'maya.cmds.palettePort(' +
-                                '\"'+categoryDict.keys()[0]+name +
-                                'Material'+'\", query=True, rgb=True)\n'
-                                'sxtools.sxglobals.tools.setMaterialPalette(' +
-                                '\"'+categoryDict.keys()[0] +
-                                '\", \"'+name+'\")\n'
-                                'sxtools.sxglobals.tools.setPaintColor('
-                                'sxtools.sxglobals.settings.currentColor)'))
+                            changeCommand=functools.partial(
+                                self.pickMaterialPalette, category, name))
                         sxglobals.tools.getPalette(
-                            categoryDict.keys()[0]+name+'Material',
-                            categoryDict.keys()[0],
+                            rowName+'Material',
+                            category,
                             name)
                         maya.cmds.button(
-                            categoryDict.keys()[0]+name+'Button',
+                            rowName+'Button',
                             label='Apply',
                             height=20,
                             ann='Shift-click to delete material',
-                            command=(
-                                'sxtools.sxglobals.tools.materialButtonManager(' +
-                                '\"'+categoryDict.keys()[0] +
-                                '\", \"'+name+'\")'))
+                            command=functools.partial(
+                                self.applyMaterialPalette, category, name))
 
         maya.cmds.frameLayout(
             'createMaterialFrame',
@@ -1949,7 +1919,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=5,
             collapsable=True,
-            collapse=sxglobals.settings.frames['newMaterialCollapse'],
+            collapse=frames['newMaterialCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['newMaterialCollapse']=True"),
             expandCommand=(
@@ -2046,7 +2016,7 @@ class UI(object):
             marginWidth=5,
             marginHeight=5,
             collapsable=True,
-            collapse=sxglobals.settings.frames['materialSettingsCollapse'],
+            collapse=frames['materialSettingsCollapse'],
             collapseCommand=(
                 "sxtools.sxglobals.settings.frames['materialSettingsCollapse']=True"),
             expandCommand=(
@@ -2272,12 +2242,11 @@ class UI(object):
             expandCommand=(
                 "sxtools.sxglobals.settings.frames['skinMeshCollapse']=False"))
 
-        if maya.cmds.objExists(str(sxglobals.settings.objectArray[0]).split('|')[-1].split('_var')[0] + '_skinned'):
+        objName = str(sxglobals.settings.objectArray[0]).split('|')[-1]
+        if maya.cmds.objExists(objName.split('_var')[0] + '_skinned'):
             maya.cmds.text(
                 parent='skinMeshFrame',
-                label=(
-                    'Skinning Mesh already exists for ' +
-                    str(sxglobals.settings.objectArray[0]).split('|')[-1]),
+                label='Skinning Mesh already exists for ' + objName,
                 ww=True)
         else:
             maya.cmds.button(